@@ -1,10 +1,138 @@
+import requests
+from requests.adapters import HTTPAdapter
+from collections import OrderedDict
+import threading
+from util.metrics import metrics
+
 class LeagueApiInterface:
     BASE_URL = ""
     ENDPOINT_TEAMS = ""
     ENDPOINT_SCHEDULE = ""
 
+    # Seconds to wait to connect, and then for the response.
+    TIMEOUT = (5, 15)
+
+    # One pooled session is shared by every service for the life of the process, so connections are kept alive between refreshes.
+    session = None
+    sessionLock = threading.Lock()
+
+    # Max number of URLs per service to remember validators and parsed results for.
+    MAX_CACHED_URLS = 64
+
+    # Counts of JSON documents parsed, and of requests answered with 304 Not Modified, across all services.
+    jsonParses = 0
+    notModified = 0
+    statsLock = threading.Lock()
+
     def __init__(self, ) -> None:
-        pass
+        self.responses = OrderedDict()
+        self.responsesLock = threading.Lock()
+
+    @classmethod
+    def getSession(cls):
+        """Returns the shared session, creating it on first use."""
+        with LeagueApiInterface.sessionLock:
+            if LeagueApiInterface.session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                session.headers.update({'Accept-Encoding': 'gzip, deflate', 'Connection': 'keep-alive'})
+                LeagueApiInterface.session = session
+            return LeagueApiInterface.session
+
+    @classmethod
+    def useSession(cls, session):
+        """Replaces the shared session. Used to replay or record fixtures, see api/fixtures.py."""
+        with LeagueApiInterface.sessionLock:
+            LeagueApiInterface.session = session
+
+    @classmethod
+    def getConnectionStats(cls):
+        """Returns how many requests have been made and how many new connections they needed. Anything more than one connection per host means handshakes are being repeated.
+
+        Returns:
+            stats (dict): Total requests, new connections, and requests that reused a connection.
+        """
+        stats = {'requests': 0, 'connections': 0, 'reused': 0}
+        session = LeagueApiInterface.session
+        if session is None:
+            return stats
+
+        # Fixture sessions don't have any connections.
+        for adapter in set(getattr(session, 'adapters', {}).values()):
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is not None:
+                    stats['requests'] += pool.num_requests
+                    stats['connections'] += pool.num_connections
+
+        stats['reused'] = stats['requests'] - stats['connections']
+        return stats
+
+    def fetch(self, url, headers=None):
+        """Makes a GET request using the shared session.
+
+        Args:
+            url (string): The full URL to request.
+            headers (dict): Any extra headers to send.
+
+        Returns:
+            response (Response): The response. Raises if the request failed or returned an error status.
+        """
+        with metrics.timer('http'):
+            response = self.getSession().get(url=url, headers=headers, timeout=self.TIMEOUT)
+        response.raise_for_status()
+        return response
+
+    def fetchParsed(self, url, parse):
+        """Makes a conditional GET request, and parses the JSON response only if it changed since the last request to the same URL.
+
+        Args:
+            url (string): The full URL to request.
+            parse (function): Turns the response JSON into the result. Only called when the response has changed.
+
+        Returns:
+            result: What parse returned. If the server answered 304 Not Modified, the same object as last time is returned.
+        """
+        with self.responsesLock:
+            cached = self.responses.get(url)
+
+        # Send the validators from the last response, if there was one.
+        headers = {}
+        if cached:
+            if cached['etag']:
+                headers['If-None-Match'] = cached['etag']
+            if cached['lastModified']:
+                headers['If-Modified-Since'] = cached['lastModified']
+
+        response = self.fetch(url, headers)
+
+        if response.status_code == 304 and cached:
+            with LeagueApiInterface.statsLock:
+                LeagueApiInterface.notModified += 1
+            with self.responsesLock:
+                if url in self.responses:
+                    self.responses.move_to_end(url)
+            return cached['result']
+
+        with LeagueApiInterface.statsLock:
+            LeagueApiInterface.jsonParses += 1
+        with metrics.timer('parse'):
+            result = parse(response.json())
+
+        # Only remember the response if the server gave validators to check against next time.
+        etag = response.headers.get('ETag')
+        lastModified = response.headers.get('Last-Modified')
+        if result is not None and (etag or lastModified):
+            with self.responsesLock:
+                self.responses[url] = {'etag': etag, 'lastModified': lastModified, 'result': result}
+                self.responses.move_to_end(url)
+                if len(self.responses) > self.MAX_CACHED_URLS:
+                    self.responses.popitem(last=False)
+
+        return result
 
     def getTeamData(self):
         """Get team names and abreviations from the League API, return information as a list of dictionaries.
@@ -13,6 +141,14 @@ class LeagueApiInterface:
         """
         pass
 
+    def getSchedule(self):
+        """Returns today's schedule as of the last call to getGameData, for leagues that fetch the details of each game separately.
+
+        Returns:
+            schedule (list of dictionaries): The 'gameId', 'status' and 'startTimeUtc' of each game. Empty if the games are all fetched at once.
+        """
+        return []
+
     def getGameData(self, teams):
         """Get game data for all of todays games from the League API, returns games as a list of dictionaries.
 
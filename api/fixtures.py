@@ -0,0 +1,68 @@
+from urllib.parse import urlsplit
+import json
+import os
+import threading
+
+class FixtureResponse:
+    """Stands in for a requests Response, serving a recorded body."""
+
+    def __init__(self, content, statusCode=200) -> None:
+        self.content = content
+        self.status_code = statusCode
+        self.headers = {}
+
+    def json(self):
+        return json.loads(self.content)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise Exception(f'Fixture request failed with status {self.status_code}')
+
+class FixtureSession:
+    """Stands in for the shared requests Session, serving recorded responses from a directory instead of the network.
+
+    The directory holds an index.json mapping each recorded URL to a file. URLs are matched exactly first,
+    then without their query string, so a schedule recorded on one date still replays on another.
+    """
+
+    def __init__(self, directory) -> None:
+        self.directory = directory
+        with open(os.path.join(directory, 'index.json')) as fp:
+            self.index = json.load(fp)
+
+        self.byPath = {}
+        for url, filename in self.index.items():
+            self.byPath.setdefault(urlsplit(url).path, filename)
+
+    def get(self, url, headers=None, timeout=None):
+        filename = self.index.get(url) or self.byPath.get(urlsplit(url).path)
+        if filename is None:
+            return FixtureResponse(b'', 404)
+
+        with open(os.path.join(self.directory, filename), 'rb') as fp:
+            return FixtureResponse(fp.read())
+
+class RecordingSession:
+    """Wraps a real session, saving every response it gets to a directory that FixtureSession can replay."""
+
+    def __init__(self, session, directory) -> None:
+        self.session = session
+        self.directory = directory
+        self.index = {}
+        self.lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def get(self, url, headers=None, timeout=None):
+        # Conditional requests would record empty 304s, so always ask for the full response.
+        response = self.session.get(url=url, timeout=timeout)
+
+        if response.status_code == 200:
+            with self.lock:
+                filename = self.index.get(url) or f'{len(self.index):04d}.json'
+                with open(os.path.join(self.directory, filename), 'wb') as fp:
+                    fp.write(response.content)
+                self.index[url] = filename
+                with open(os.path.join(self.directory, 'index.json'), 'w') as fp:
+                    json.dump(self.index, fp, indent=2)
+
+        return response
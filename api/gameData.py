@@ -1,42 +1,87 @@
 from api.nhlService import NhlService
 from api.mlbService import MlbService
-import random
+from api.gameOrder import gameOrder
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
 import time
 
-def fetchGameData ():
-    nhlService = NhlService()
-    mlbService = MlbService()
-
-    networkError = False
-    games = []
-
-    # Try to get team and game data. Max of 100 attempts before it gives up.
-    for i in range(100):
-        try:
-            mlb = mlbService.getGameData()
-            nhl = nhlService.getGameData()
-            games = mlb + nhl
-            random.shuffle(games)
-            networkError = False
-            break
+# Max number of attempts to fetch a league before giving up on it.
+MAX_ATTEMPTS = 100
+
+# Once at least one league has data, stop retrying the others after this many attempts rather than holding up the scoreboard.
+MAX_PARTIAL_ATTEMPTS = 3
+
+# Max number of seconds to wait on a single league before treating the attempt as failed.
+# For MLB this includes getting the details of every game.
+LEAGUE_TIMEOUT = 30
+
+# Shared pool that the leagues are fetched on. Not used as a context manager so that a hung request can't block the caller past its timeout.
+executor = ThreadPoolExecutor(max_workers=4)
+
+# Each league's latest fetch. A fetch that timed out may still be running on the pool, and is waited on again rather than started twice.
+inFlight = {}
+
+# Services live for the whole process so that they share one pooled HTTP session.
+nhlService = NhlService()
+mlbService = MlbService()
+
+services = {
+    'mlb': mlbService,
+    'nhl': nhlService
+}
+
+def fetchLeagueGames(leagues=None, attempts=MAX_ATTEMPTS):
+    """Fetches the games of each league at the same time.
 
-            # In the event that the NHL API cannot be reached, set the bottom right LED to red.
+    Args:
+        leagues (list of strings): Leagues to fetch. Defaults to all of them.
+        attempts (int): Max number of attempts per league before giving up on it.
+
+    Returns:
+        leagueGames (dict): Maps each league that was fetched to its list of games. Leagues that couldn't be fetched are left out.
+    """
+    leagueGames = {}
+    pending = list(leagues or services)
+
+    # Try to get team and game data for all leagues at once. Leagues that fail are retried on their own, up to a max of 100 attempts.
+    for i in range(attempts):
+        # A league still stuck on an earlier attempt is waited on again rather than submitted a second time, so it can't take over the pool.
+        futures = {}
+        for league in pending:
+            future = inFlight.get(league)
+            if future is None or future.done():
+                future = inFlight[league] = executor.submit(services[league].getGameData)
+            futures[league] = future
+        deadline = time.monotonic() + LEAGUE_TIMEOUT
+
+        for league, future in futures.items():
+            try:
+                # All leagues were started together, so they share the same deadline.
+                leagueGames[league] = future.result(timeout=max(0, deadline - time.monotonic()))
+                pending.remove(league)
+
+            # In the event that a league's API cannot be reached, keep the other leagues' data and retry just that one.
             # TODO: Make this more robust for specific fail cases.
-        except Exception as e:
-            print('Service Error')
-            print(e)
-            networkError = True
-            time.sleep(1)
-    
-    if networkError == True:
+            except TimeoutError:
+                print(f'Service Error ({league})')
+                print(f'Timed out after {LEAGUE_TIMEOUT} seconds')
+            except Exception as e:
+                print(f'Service Error ({league})')
+                print(e)
+
+        if not pending or (leagueGames and i + 1 >= MAX_PARTIAL_ATTEMPTS):
+            break
+        time.sleep(1)
+
+    if not leagueGames:
         raise Exception("Unable to fetch game data")
 
+    if pending:
+        print('Showing partial game data, unable to fetch: ' + ', '.join(pending))
 
+    return leagueGames
 
-    return games
-        
-def fetchMlbGame(gameId):
-    mlbService = MlbService()
-    return mlbService.getGameDetails(gameId)
+def combineGames(leagueGames):
+    """Combines the games of each league into the single list that's displayed, in the order they're shown."""
+    games = [game for league in services if league in leagueGames for game in leagueGames[league]]
 
-# fetchGameData()
\ No newline at end of file
+    return gameOrder.order(games)
@@ -0,0 +1,113 @@
+from collections import namedtuple
+
+# Kinds of change between two versions of the games.
+NEW = 'new'
+REMOVED = 'removed'
+SCORE = 'score'
+PERIOD = 'period'
+STATUS = 'status'
+UPDATE = 'update'
+
+# Fields that mean the game has moved on to a new period or inning. Anything not listed elsewhere is an UPDATE, ex. the clock or the count.
+SCORE_FIELDS = ('homeScore', 'awayScore')
+PERIOD_FIELDS = ('periodNumber', 'periodName', 'currentInning', 'inningState')
+STATUS_FIELDS = ('status', 'detailedStatus')
+
+class GameEvent(namedtuple('GameEvent', ['kind', 'game', 'previous', 'fields'])):
+    """A change to a single game between two snapshots.
+
+    Attributes:
+        kind (string): What changed. One of NEW, REMOVED, SCORE, PERIOD, STATUS or UPDATE.
+        game (GameRecord): The game as it is now. For REMOVED, the game as it was last seen.
+        previous (GameRecord): The game as it was before. None for NEW.
+        fields (tuple of strings): Names of the fields behind this event. Empty for NEW and REMOVED.
+    """
+    __slots__ = ()
+
+    @property
+    def key(self):
+        return gameKey(self.game)
+
+    def getScoringTeams(self):
+        """Returns which teams' scores went up, as a list of 'home' and/or 'away'. Only meaningful for SCORE events."""
+        if self.kind != SCORE:
+            return []
+        return [side for side in ('away', 'home') if getattr(self.game, side + 'Score') > getattr(self.previous, side + 'Score')]
+
+def gameKey(game):
+    """Returns the key that identifies a game across snapshots."""
+    return (game.league, game.gameId)
+
+def diffGame(previous, game):
+    """Compares two versions of the same game field by field.
+
+    Args:
+        previous (GameRecord): The game from the last snapshot.
+        game (GameRecord): The game from the new snapshot.
+
+    Returns:
+        events (list of GameEvents): At most one event of each kind, in the order SCORE, PERIOD, STATUS, UPDATE. Empty if nothing changed.
+    """
+    # Records are immutable and unchanged games are usually the same object, so most games stop here.
+    if game is previous or game == previous:
+        return []
+
+    # A game that changed type (ex. a league gets its first game of the day) is treated as replaced.
+    if type(game) is not type(previous):
+        return [GameEvent(REMOVED, previous, None, ()), GameEvent(NEW, game, None, ())]
+
+    changed = previous.diff(game)
+    events = []
+    for kind, kindFields in ((SCORE, SCORE_FIELDS), (PERIOD, PERIOD_FIELDS), (STATUS, STATUS_FIELDS)):
+        matched = tuple(f for f in changed if f in kindFields)
+        if matched:
+            events.append(GameEvent(kind, game, previous, matched))
+
+    other = tuple(f for f in changed if f not in SCORE_FIELDS + PERIOD_FIELDS + STATUS_FIELDS)
+    if other:
+        events.append(GameEvent(UPDATE, game, previous, other))
+
+    return events
+
+def diffGames(previousGames, games):
+    """Compares two sets of games and returns everything that changed between them.
+
+    Args:
+        previousGames (list of GameRecords): Games from the last snapshot.
+        games (list of GameRecords): Games from the new snapshot.
+
+    Returns:
+        events (list of GameEvents): Changed and new games in the order of games, followed by removed games.
+    """
+    previousByKey = {gameKey(game): game for game in previousGames}
+    keys = set()
+    events = []
+
+    for game in games:
+        key = gameKey(game)
+        keys.add(key)
+        previous = previousByKey.get(key)
+
+        if previous is None:
+            events.append(GameEvent(NEW, game, None, ()))
+        else:
+            events.extend(diffGame(previous, game))
+
+    for key, previous in previousByKey.items():
+        if key not in keys:
+            events.append(GameEvent(REMOVED, previous, None, ()))
+
+    return events
+
+def reuseUnchanged(previousGames, games):
+    """Swaps in the previous record of every game that hasn't changed, so an unchanged game stays the same object across snapshots.
+
+    Returns:
+        games (list of GameRecords): The new games, in the same order.
+    """
+    previousByKey = {gameKey(game): game for game in previousGames}
+    reused = []
+    for game in games:
+        previous = previousByKey.get(gameKey(game))
+        reused.append(previous if previous == game else game)
+    return reused
@@ -0,0 +1,65 @@
+from datetime import datetime
+
+# Groups that games are shown in, in order.
+LIVE = 0
+UPCOMING = 1
+FINISHED = 2
+NO_GAMES = 3
+
+# Leagues in the order their games are shown when everything else is equal.
+LEAGUE_ORDER = ['nhl', 'mlb']
+
+def getGroup(game):
+    """Returns which group a game is shown in, based on its state."""
+    if game.gameId == 'NO_GAMES':
+        return NO_GAMES
+
+    # Postponed games won't be played today, so they go with the finished ones.
+    if getattr(game, 'detailedStatus', None) == "Postponed" or game.status in ("Postponed", "Final"):
+        return FINISHED
+
+    if game.status == "Preview":
+        return UPCOMING
+
+    return LIVE
+
+class GameOrder:
+    """Puts games in the order they're shown. The same games always come out in the same order, so positions only move when a game's state does.
+
+    Games of favourite teams come first. After that, live games, then upcoming games by start time, then finished and postponed games.
+    Favourites are team abbreviations, either on their own (ex. 'TOR') or tied to a league (ex. 'mlb:TOR').
+    """
+
+    def __init__(self, favourites=()) -> None:
+        self.favourites = list(favourites)
+
+    def isFavourite(self, game):
+        for favourite in self.favourites:
+            league, _, abbreviation = favourite.rpartition(':')
+            if league and league.lower() != game.league:
+                continue
+            if abbreviation.upper() in (getattr(game, 'homeAbbrev', None), getattr(game, 'awayAbbrev', None)):
+                return True
+        return False
+
+    def getSortKey(self, game):
+        """Returns the key that games are sorted by."""
+        startTime = getattr(game, 'startTimeUtc', None)
+        league = LEAGUE_ORDER.index(game.league) if game.league in LEAGUE_ORDER else len(LEAGUE_ORDER)
+
+        # Games without a start time go after those with one. Ties fall back to the league and game ID, which never change.
+        return (
+            not self.isFavourite(game),
+            getGroup(game),
+            startTime is None,
+            startTime or datetime.min,
+            league,
+            str(game.gameId)
+        )
+
+    def order(self, games):
+        """Returns the games in the order they're shown."""
+        return sorted(games, key=self.getSortKey)
+
+# Shared by everything that shows games. Favourites are set from the command line.
+gameOrder = GameOrder()
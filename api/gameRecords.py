@@ -0,0 +1,72 @@
+from dataclasses import dataclass, fields
+from datetime import datetime
+
+# Each record declares __slots__ for the fields it adds, so records don't carry a __dict__.
+# Records are frozen, which also makes them hashable, and are built directly by the league services.
+
+@dataclass(frozen=True)
+class GameRecord:
+    """Base of every record. Identifies a game and the league it's in."""
+    __slots__ = ('gameId', 'league')
+    gameId: object
+    league: str
+
+    def diff(self, other):
+        """Returns the names of the fields that differ between this record and another of the same type."""
+        return [f.name for f in fields(self) if getattr(self, f.name) != getattr(other, f.name)]
+
+@dataclass(frozen=True)
+class NoGamesRecord(GameRecord):
+    """Stands in for a league's games when it has none today. gameId is always 'NO_GAMES'."""
+    __slots__ = ()
+
+def noGames(league):
+    """Returns the record for a league with no games today."""
+    return NoGamesRecord('NO_GAMES', league)
+
+@dataclass(frozen=True)
+class TeamGameRecord(GameRecord):
+    """Fields shared by games in every league."""
+    __slots__ = ('status', 'homeTeam', 'homeAbbrev', 'awayTeam', 'awayAbbrev', 'homeScore', 'awayScore', 'startTimeUtc')
+    status: str
+    homeTeam: str
+    homeAbbrev: str
+    awayTeam: str
+    awayAbbrev: str
+    homeScore: int
+    awayScore: int
+    startTimeUtc: datetime
+
+@dataclass(frozen=True)
+class NhlGameRecord(TeamGameRecord):
+    """An NHL game. Period fields are "Not Started" until the game begins."""
+    __slots__ = ('detailedStatus', 'startTimeLocal', 'periodNumber', 'periodName', 'periodTimeRemaining')
+    detailedStatus: str
+    startTimeLocal: datetime
+    periodNumber: int
+    periodName: str
+    periodTimeRemaining: str
+
+@dataclass(frozen=True)
+class MlbGameRecord(TeamGameRecord):
+    """An MLB game. Scores are runs. Base runners are just whether each base is occupied."""
+    __slots__ = (
+        'homeHits', 'awayHits', 'homeErrors', 'awayErrors', 'currentInning', 'inningState', 'balls', 'strikes', 'outs',
+        'onFirst', 'onSecond', 'onThird', 'startTime', 'startAmPm', 'homeStartingPitcher', 'awayStartingPitcher'
+    )
+    homeHits: int
+    awayHits: int
+    homeErrors: int
+    awayErrors: int
+    currentInning: int
+    inningState: str
+    balls: int
+    strikes: int
+    outs: int
+    onFirst: bool
+    onSecond: bool
+    onThird: bool
+    startTime: str
+    startAmPm: str
+    homeStartingPitcher: str
+    awayStartingPitcher: str
@@ -1,15 +1,36 @@
-import requests
 from .api import LeagueApiInterface
+from .gameRecords import MlbGameRecord, noGames
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 from util import timeUtil
 import json
 
+# Fields of the live feed that are needed once a game has started. The API filters the feed down to these by key name,
+# which cuts out the play by play and player data. Starting pitchers aren't shown once a game has started, so they aren't needed.
+SLIM_FEED_FIELDS = [
+    'gameData', 'status', 'abstractGameState', 'detailedState', 'teams', 'home', 'away', 'name', 'abbreviation',
+    'datetime', 'dateTime', 'time', 'ampm',
+    'liveData', 'linescore', 'currentInning', 'inningState', 'balls', 'strikes', 'outs', 'runs', 'hits',
+    'offense', 'batter', 'first', 'second', 'third', 'id',
+    'boxscore', 'teamStats', 'fielding', 'errors'
+]
+
+# Max number of game feeds to request at the same time.
+MAX_DETAIL_REQUESTS = 6
+
+# Game states where the slim feed has everything that's displayed.
+SLIM_FEED_STATES = ['Live', 'Final']
+
 class MlbService(LeagueApiInterface):
     def __init__(self) -> None:
         super().__init__()
         self.BASE_URL = "https://statsapi.mlb.com/api/v1/"
         self.ENDPOINT_TEAMS = "teams?sportId=1"
         self.ENDPOINT_SCHEDULE = "schedule?sportId=1" #&date=07/10/2022"
+        self.ENDPOINT_FEED = "https://statsapi.mlb.com/api/v1.1/game/{gameId}/feed/live"
+
+        # Today's schedule as of the last refresh. Lets polls be scheduled from start times even if some game details couldn't be fetched.
+        self.schedule = []
 
     def getGameData(self):
         """Get game data for all of todays games from the NHL API, returns games as a list of dictionaries.
@@ -18,14 +39,39 @@ class MlbService(LeagueApiInterface):
             teams (list of dictionaries): Team names and abberivations. Needed as the game API doen't return team abbreviations.
 
         Returns:
-            games (list of dictionaries): All game info needed to display on scoreboard. Teams, scores, start times, game clock, etc.
+            games (list of MlbGameRecord): All game info needed to display on scoreboard. Teams, scores, start times, game clock, etc.
+        """
+
+        # Call the MLB API for today's game info. Only parsed if it changed since the last call, otherwise the last games list is reused.
+        schedule = self.fetchParsed(self.BASE_URL + self.ENDPOINT_SCHEDULE, self.parseGameData)
+        self.schedule = schedule
+
+        # The schedule only has IDs, so get the details of every game now rather than while they're being displayed.
+        return self.getAllGameDetails(schedule)
+
+    def getAllGameDetails(self, schedule):
+        """Gets the details of every game in the schedule at once.
+
+        Args:
+            schedule (list of dictionaries): Game IDs and states, as returned by parseGameData.
+
+        Returns:
+            games (list of MlbGameRecord): Details of each game, in the same order as the schedule. Games whose details couldn't be parsed are left out.
         """
+        with ThreadPoolExecutor(max_workers=MAX_DETAIL_REQUESTS) as executor:
+            details = list(executor.map(self.tryGameDetails, schedule))
 
-        
+        games = []
+        for game, gameDetails in zip(schedule, details):
+            if gameDetails is None:
+                print(f"Skipping MLB game {game['gameId']}, details unavailable")
+                continue
+            games.append(gameDetails)
 
-        # Call the NHL API for today's game info. Save the rsult as a JSON object.
-        gamesResponse = requests.get(url=self.BASE_URL + self.ENDPOINT_SCHEDULE)
-        gamesJson = gamesResponse.json()
+        return games
+
+    def parseGameData(self, gamesJson):
+        """Builds the list of game IDs, states and start times from the MLB schedule JSON. The details of each game come from its live feed."""
 
         # Decalare an empty list to hold the games dicts.
         games = []
@@ -38,7 +84,8 @@ class MlbService(LeagueApiInterface):
                     # Prep the dict data.
                     gameDict = {
                         'gameId': game['gamePk'],
-                        'league': "mlb"
+                        'status': game['status']['abstractGameState'],
+                        'startTimeUtc': datetime.strptime(game['gameDate'], '%Y-%m-%dT%H:%M:%SZ')
                     }                    
                 except Exception as e:
                     print("Caught")
@@ -55,17 +102,59 @@ class MlbService(LeagueApiInterface):
             print('No Games today')
             games.append({
                 'gameId': 'NO_GAMES',
-                'league': "mlb"
+                'status': None,
+                'startTimeUtc': None
             })
         return games
 
-    def getGameDetails(self, gameId):
+    def getSchedule(self):
+        return self.schedule
 
-        if gameId == 'NO_GAMES':
-            return {'gameId': 'NO_GAMES'}
+    def tryGameDetails(self, game):
+        """Gets the details of a game from the schedule. Returns None if they couldn't be fetched, so one bad feed doesn't fail the whole league."""
+        try:
+            return self.getGameDetails(game['gameId'], game.get('status'))
+        except Exception as e:
+            print(f"Unable to fetch MLB game {game['gameId']}")
+            print(e)
+            return None
+
+    def getGameDetails(self, gameId, status=None):
+        """Get all the details needed to display a single game from the MLB live feed.
 
-        feed = requests.get(url=f'https://statsapi.mlb.com/api/v1.1/game/{gameId}/feed/live')
-        feed = feed.json()
+        Args:
+            gameId (int): ID of the game.
+            status (string): State of the game from the schedule, if known. Games that have started only need the slim feed.
+
+        Returns:
+            game (MlbGameRecord): All game info needed to display on scoreboard.
+        """
+
+        if gameId == 'NO_GAMES':
+            return noGames('mlb')
+
+        # Try the slim feed first if it has everything needed. Fall back to the full feed if anything is missing.
+        if status in SLIM_FEED_STATES:
+            try:
+                game = self.fetchParsed(self.getFeedUrl(gameId, slim=True), lambda feed: self.parseGameDetails(gameId, feed))
+                if game is not None:
+                    return game
+            except Exception as e:
+                print(f'Slim feed failed for MLB game {gameId}, trying the full feed')
+                print(e)
+
+        # Only parsed if the feed changed since the last call, otherwise the last details are reused.
+        return self.fetchParsed(self.getFeedUrl(gameId), lambda feed: self.parseGameDetails(gameId, feed))
+
+    def getFeedUrl(self, gameId, slim=False):
+        """Returns the URL of a game's live feed. The slim feed is filtered down to SLIM_FEED_FIELDS."""
+        url = self.ENDPOINT_FEED.format(gameId=gameId)
+        if slim:
+            url += '?fields=' + ','.join(SLIM_FEED_FIELDS)
+        return url
+
+    def parseGameDetails(self, gameId, feed):
+        """Builds the game record from the MLB live feed JSON. Returns None if the feed is missing anything that's needed."""
 
         try:
             gameData = feed['gameData']
@@ -73,59 +162,60 @@ class MlbService(LeagueApiInterface):
             linescore = feed['liveData']['linescore']
             boxscore = feed['liveData']['boxscore']
 
-            first = []
-            second = []
-            third = []
-
-            if 'first' in linescore['offense']:
-                first = linescore['offense']['first']
+            # Until a game starts, the linescore has no inning and no runs or hits. Those default to 0 so games that haven't started or were postponed still get records.
+            homeLine = linescore.get('teams', {}).get('home', {})
+            awayLine = linescore.get('teams', {}).get('away', {})
+            offense = linescore.get('offense', {})
 
-            if 'second' in linescore['offense']:
-                second = linescore['offense']['second']
+            # Postponed games are Final in abstractGameState, only detailedState says they were postponed.
+            status = gameData['status']['abstractGameState']
+            if gameData['status'].get('detailedState') == "Postponed":
+                status = "Postponed"
 
-            if 'third' in linescore['offense']:
-                third = linescore['offense']['third']
+            # Not in the slim feed.
+            probablePitchers = gameData.get('probablePitchers', {})
 
-            if 'away' in gameData['probablePitchers']:
-                awayStartingPitcher = gameData['probablePitchers']['away']['id']
+            if 'away' in probablePitchers:
+                awayStartingPitcher = probablePitchers['away']['id']
                 awayStartingPitcher = gameData['players'][f'ID{awayStartingPitcher}']['lastName']
             else:
                 awayStartingPitcher = 'TBD'
 
-            if 'home' in gameData['probablePitchers']:
-                homeStartingPitcher = gameData['probablePitchers']['home']['id']
+            if 'home' in probablePitchers:
+                homeStartingPitcher = probablePitchers['home']['id']
                 homeStartingPitcher = gameData['players'][f'ID{homeStartingPitcher}']['lastName']
             else:
                 homeStartingPitcher = 'TBD'
 
-            # Prep the dict data.
-            return {
-                'gameId': gameId,
-                'homeTeam': teams['home']['name'],
-                'homeAbbrev': teams['home']['abbreviation'],
-                'awayTeam': teams['away']['name'],
-                'awayAbbrev': teams['away']['abbreviation'],
-                'homeRuns': linescore['teams']['home']['runs'],
-                'awayRuns': linescore['teams']['away']['runs'],
-                'homeHits': linescore['teams']['home']['hits'],
-                'awayHits': linescore['teams']['away']['hits'],
-                'homeErrors': boxscore['teams']['home']['teamStats']['fielding']['errors'],
-                'awayErrors': boxscore['teams']['away']['teamStats']['fielding']['errors'],
-                'status': gameData['status']['abstractGameState'],
-                'currentInning':  linescore['currentInning'],
-                'inningState': linescore['inningState'],
-                'balls': linescore['balls'],
-                'strikes': linescore['strikes'],
-                'outs': linescore['outs'],
-                'atBat': linescore['offense']['batter'],
-                'onFirst': first,
-                'onSecond': second,
-                'onThird': third,
-                'dateTime': gameData['datetime'],
-                'homeStartingPitcher': homeStartingPitcher,
-                'awayStartingPitcher': awayStartingPitcher,
-                'league': "mlb"
-            }                    
+            # Prep the record.
+            return MlbGameRecord(
+                gameId=gameId,
+                league="mlb",
+                status=status,
+                homeTeam=teams['home']['name'],
+                homeAbbrev=teams['home']['abbreviation'],
+                awayTeam=teams['away']['name'],
+                awayAbbrev=teams['away']['abbreviation'],
+                homeScore=homeLine.get('runs', 0),
+                awayScore=awayLine.get('runs', 0),
+                startTimeUtc=datetime.strptime(gameData['datetime']['dateTime'], '%Y-%m-%dT%H:%M:%SZ'),
+                homeHits=homeLine.get('hits', 0),
+                awayHits=awayLine.get('hits', 0),
+                homeErrors=boxscore['teams']['home']['teamStats']['fielding'].get('errors', 0),
+                awayErrors=boxscore['teams']['away']['teamStats']['fielding'].get('errors', 0),
+                currentInning=linescore.get('currentInning', 0),
+                inningState=linescore.get('inningState', ''),
+                balls=linescore.get('balls', 0),
+                strikes=linescore.get('strikes', 0),
+                outs=linescore.get('outs', 0),
+                onFirst='first' in offense,
+                onSecond='second' in offense,
+                onThird='third' in offense,
+                startTime=gameData['datetime']['time'],
+                startAmPm=gameData['datetime']['ampm'],
+                homeStartingPitcher=homeStartingPitcher,
+                awayStartingPitcher=awayStartingPitcher
+            )
         except Exception as e:
             print("Caught")
             print(e)
@@ -1,53 +1,152 @@
-import requests
 from .api import LeagueApiInterface
+from .gameRecords import NhlGameRecord, noGames
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 from util import timeUtil
+import json
+import os
+import time
+
+# Team names and abbreviations rarely change, so only refetch them every few days.
+TEAMS_TTL = 3 * 24 * 60 * 60
+
+# A team missing from the team data (ex. a new franchise) forces a refetch, but no more often than this.
+TEAMS_MISS_INTERVAL = 60 * 60
+
+# Where the team data is kept between restarts.
+TEAMS_CACHE_PATH = "cache/nhlTeams.json"
 
 class NhlService(LeagueApiInterface):
-    def getTeamData(self):
-        """Get team names and abreviations from the NHL API, return information as a list of dictionaries.
+    def __init__(self) -> None:
+        super().__init__()
+        self.teams = None
+        self.teamsFetched = 0
+
+        # When a missing team last forced a refetch. Kept apart from teamsFetched, so a refetch that fails doesn't make the team data look stale.
+        self.teamsMissRefetched = 0
+
+    def getTeamData(self, force=False):
+        """Get team names and abreviations, return information as a dictionary indexed by team ID and name.
+        Uses the cached copy if it's younger than TEAMS_TTL, and falls back to a stale copy if the NHL API can't be reached.
+
+        Args:
+            force (bool): Refetch even if the cached copy is young enough.
 
         Returns:
-            teams (list of dictionaries): Each dict contains the longform name and abbreviation of a single NHL team.
+            teams (dict): 'byId' and 'byName' each map to dicts containing the longform name and abbreviation of a single NHL team.
         """
-        # Call the NHL Teams API. Store as a JSON object.
-        teamsResponse = requests.get(url="https://statsapi.web.nhl.com/api/v1/teams")
-        teamsJson = teamsResponse.json()
+        # Load whatever was saved by a previous run.
+        if self.teams is None:
+            self.loadTeamCache()
+
+        if not force and self.teams is not None and time.time() - self.teamsFetched < TEAMS_TTL:
+            return self.teams
 
-        # Decalare an empty list to hold the team dicts.
-        teams = []
+        try:
+            # Call the NHL Teams API. Store as a JSON object.
+            teamsResponse = self.fetch("https://statsapi.web.nhl.com/api/v1/teams")
+            teamsJson = teamsResponse.json()
+        except Exception as e:
+            # Stale team data is still better than none.
+            if self.teams is not None:
+                print('Unable to refresh NHL teams, using cached copy')
+                print(e)
+                return self.teams
+            raise
 
-        # For each team, build a dict recording it's name and abbreviation. Append this to the end of the teams list.
-        for team in teamsJson['teams']:
+        self.teams = self.indexTeams(teamsJson['teams'])
+        self.teamsFetched = time.time()
+        self.saveTeamCache(teamsJson['teams'])
+
+        return self.teams
+
+    def indexTeams(self, teamsList):
+        """Builds dicts of team name and abbreviation, keyed by both team ID and team name for O(1) lookups."""
+        teams = {'byId': {}, 'byName': {}}
+
+        # For each team, build a dict recording it's name and abbreviation.
+        for team in teamsList:
             teamDict = {
                     'Team Name': team['name'],
                     'Team Abbreviation': team['abbreviation']
             }
-            # Append dict to the end of the teams list.
-            teams.append(teamDict)
-        
+            teams['byId'][team['id']] = teamDict
+            teams['byName'][team['name']] = teamDict
+
         return teams
 
-    def getGameData(self):
-        """Get game data for all of todays games from the NHL API, returns games as a list of dictionaries.
+    def getAbbreviation(self, teams, team):
+        """Returns the abbreviation of a team from the schedule, looking it up by ID and then by name.
+        If the team is missing, the team data is refetched once and checked again. Falls back to the first three letters of the team's name.
+        """
+        teamDict = self.findTeam(teams, team)
 
-        Args:
-            teams (list of dictionaries): Team names and abberivations. Needed as the game API doen't return team abbreviations.
+        # The cached team data may be from before the team existed or was renamed.
+        if teamDict is None and time.time() - self.teamsMissRefetched >= TEAMS_MISS_INTERVAL:
+            print(f"NHL team {team['name']} missing from team data, refetching")
+            self.teamsMissRefetched = time.time()
+            teamDict = self.findTeam(self.getTeamData(force=True), team)
+
+        if teamDict is None:
+            return team['name'][:3].upper()
+        return teamDict['Team Abbreviation']
+
+    def findTeam(self, teams, team):
+        """Returns the name and abbreviation of a team from the schedule, or None if it's not in the team data."""
+        return teams['byId'].get(team.get('id')) or teams['byName'].get(team.get('name'))
+
+    def loadTeamCache(self):
+        try:
+            with open(TEAMS_CACHE_PATH) as fp:
+                cache = json.load(fp)
+            self.teams = self.indexTeams(cache['teams'])
+            self.teamsFetched = cache['fetched']
+        except (OSError, ValueError, KeyError):
+            pass
+
+    def saveTeamCache(self, teamsList):
+        # Only the fields that are needed are kept.
+        teamsList = [{'id': t['id'], 'name': t['name'], 'abbreviation': t['abbreviation']} for t in teamsList]
+        try:
+            os.makedirs(os.path.dirname(TEAMS_CACHE_PATH), exist_ok=True)
+            with open(TEAMS_CACHE_PATH + '.tmp', 'w') as fp:
+                json.dump({'fetched': self.teamsFetched, 'teams': teamsList}, fp)
+            os.replace(TEAMS_CACHE_PATH + '.tmp', TEAMS_CACHE_PATH)
+        except OSError as e:
+            print('Unable to cache NHL teams')
+            print(e)
+
+    def getGameData(self):
+        """Get game data for all of todays games from the NHL API, returns games as a list of records.
 
         Returns:
-            games (list of dictionaries): All game info needed to display on scoreboard. Teams, scores, start times, game clock, etc.
+            games (list of NhlGameRecord): All game info needed to display on scoreboard. Teams, scores, start times, game clock, etc.
         """
 
-        teams = self.getTeamData()
+        # Get the team data in the background while today's games are fetched. Neither request depends on the other.
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            teamsFuture = executor.submit(self.getTeamData)
 
-        # Call the NHL API for today's game info. Save the rsult as a JSON object.
-        gamesResponse = requests.get(url="https://statsapi.web.nhl.com/api/v1/schedule?expand=schedule.linescore&date=" + datetime.today().strftime('%Y-%m-%d'))
-        gamesJson = gamesResponse.json()
+            # Call the NHL API for today's game info. Only parsed if it changed since the last call, otherwise the last games list is reused.
+            return self.fetchParsed(
+                "https://statsapi.web.nhl.com/api/v1/schedule?expand=schedule.linescore&date=" + datetime.today().strftime('%Y-%m-%d'),
+                lambda gamesJson: self.parseGameData(gamesJson, teamsFuture.result())
+            )
 
-        # Decalare an empty list to hold the games dicts.
+    def parseGameData(self, gamesJson, teams):
+        """Builds the list of game records from the NHL schedule JSON.
+
+        Args:
+            gamesJson (dict): Response of the schedule API.
+            teams (dict): Team names and abberivations. Needed as the game API doen't return team abbreviations.
+
+        Returns:
+            games (list of NhlGameRecord): All game info needed to display on scoreboard.
+        """
+        # Decalare an empty list to hold the game records.
         games = []
         
-        # For each game, build a dict recording it's information. Append this to the end of the teams list.
+        # For each game, build a record of it's information. Append this to the end of the games list.
         if gamesJson['dates']: # If games today.
             for game in gamesJson['dates'][0]['games']:
 
@@ -59,34 +158,34 @@ class NhlService(LeagueApiInterface):
                     perName = "Not Started"
                     perTimeRem = "Not Started"
 
-                # Prep the dict data.
-                gameDict = {
-                    'gameId': game['gamePk'],
-                    'homeTeam': game['teams']['home']['team']['name'],
-                    'homeAbbreviation': [t['Team Abbreviation'] for t in teams if t['Team Name'] == game['teams']['home']['team']['name']][0],
-                    'awayTeam': game['teams']['away']['team']['name'],
-                    'awayAbbreviation': [t['Team Abbreviation'] for t in teams if t['Team Name'] == game['teams']['away']['team']['name']][0],
-                    'homeScore': game['teams']['home']['score'],
-                    'awayScore': game['teams']['away']['score'],
-                    'startTimeUtc':  datetime.strptime(game['gameDate'], '%Y-%m-%dT%H:%M:%SZ'), # Extracts the startime from what's given by the API.
-                    'startTimeLocal': timeUtil.utcToLocal(datetime.strptime(game['gameDate'], '%Y-%m-%dT%H:%M:%SZ')), # Converts the UTC start time to the RPi's local timezone.
-                    'status': game['status']['abstractGameState'],
-                    'detailedStatus': game['status']['detailedState'],
-                    'periodNumber': game['linescore']['currentPeriod'],
-                    'periodName': perName,
-                    'periodTimeRemaining': perTimeRem,
-                    'league': 'nhl'
-                }
-
-                # Append the dict to the games list.
-                games.append(gameDict)
+                # Extracts the startime from what's given by the API.
+                startTimeUtc = datetime.strptime(game['gameDate'], '%Y-%m-%dT%H:%M:%SZ')
+
+                # Prep the record.
+                gameRecord = NhlGameRecord(
+                    gameId=game['gamePk'],
+                    league='nhl',
+                    status=game['status']['abstractGameState'],
+                    homeTeam=game['teams']['home']['team']['name'],
+                    homeAbbrev=self.getAbbreviation(teams, game['teams']['home']['team']),
+                    awayTeam=game['teams']['away']['team']['name'],
+                    awayAbbrev=self.getAbbreviation(teams, game['teams']['away']['team']),
+                    homeScore=game['teams']['home']['score'],
+                    awayScore=game['teams']['away']['score'],
+                    startTimeUtc=startTimeUtc,
+                    detailedStatus=game['status']['detailedState'],
+                    startTimeLocal=timeUtil.utcToLocal(startTimeUtc), # Converts the UTC start time to the RPi's local timezone.
+                    periodNumber=game['linescore']['currentPeriod'],
+                    periodName=perName,
+                    periodTimeRemaining=perTimeRem
+                )
+
+                # Append the record to the games list.
+                games.append(gameRecord)
 
                 # Sort list by Game ID. Ensures order doesn't cahnge as games end.
-                games.sort(key=lambda x:x['gameId'])
+                games.sort(key=lambda x:x.gameId)
 
         if len(games) == 0:
-            games.append({
-                'gameId': 'NO_GAMES',
-                'league': "nhl"
-            })
+            games.append(noGames('nhl'))
         return games
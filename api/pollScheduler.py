@@ -0,0 +1,100 @@
+from datetime import timezone
+
+# Number of seconds between polls of a game that's being played.
+LIVE_INTERVAL = 15
+
+# Number of seconds between polls during an intermission or between innings, when nothing will change for a while.
+BREAK_INTERVAL = 60
+
+# Max number of seconds between polls of a game that hasn't started. Catches delays and postponements well before start time.
+PREVIEW_INTERVAL = 30 * 60
+
+# Number of seconds between polls of a game that should have started but hasn't yet.
+DELAYED_INTERVAL = 60
+
+# Number of seconds between polls of a league with nothing left to play today. Picks up the next day's schedule.
+IDLE_INTERVAL = 60 * 60
+
+def getStartTime(startTimeUtc):
+    """Returns a scheduled start time in seconds since the epoch, or None if it isn't known."""
+    if startTimeUtc is None:
+        return None
+
+    return startTimeUtc.replace(tzinfo=timezone.utc).timestamp()
+
+def getPreviewPollTime(startTime, now):
+    """Calculates when a game that hasn't started next needs to be polled. Wakes up right at the start time, but checks in periodically until then."""
+    if startTime is None:
+        return now + PREVIEW_INTERVAL
+
+    if startTime > now:
+        return min(startTime, now + PREVIEW_INTERVAL)
+    return now + DELAYED_INTERVAL
+
+def isBreak(game):
+    """Returns whether a live game is in an intermission or between innings."""
+    if game.league == 'nhl':
+        return game.periodTimeRemaining == "END"
+    return game.inningState in ("Middle", "End")
+
+def getNextPollTime(game, now):
+    """Calculates when a game next needs to be polled, based on its state.
+
+    Args:
+        game (TeamGameRecord): All information for a specific game.
+        now (float): The current time, in seconds since the epoch.
+
+    Returns:
+        nextPoll (float): When to next poll the game, in seconds since the epoch. None if the game won't change again.
+    """
+    if game.gameId == 'NO_GAMES':
+        return None
+
+    # Postponed and finished games won't change.
+    if getattr(game, 'detailedStatus', None) == "Postponed" or game.status in ("Postponed", "Final"):
+        return None
+
+    if game.status == "Preview":
+        return getPreviewPollTime(getStartTime(game.startTimeUtc), now)
+
+    # Otherwise, the game is in progress.
+    return now + (BREAK_INTERVAL if isBreak(game) else LIVE_INTERVAL)
+
+def getScheduledPollTime(entry, now):
+    """Calculates when a game from a league's schedule next needs to be polled, from its state and start time alone.
+
+    Args:
+        entry (dict): The game's 'status' and 'startTimeUtc', as returned by the service's getSchedule.
+        now (float): The current time, in seconds since the epoch.
+
+    Returns:
+        nextPoll (float): When to next poll the game, in seconds since the epoch. None if the game won't change again.
+    """
+    if entry['status'] == "Preview":
+        return getPreviewPollTime(getStartTime(entry['startTimeUtc']), now)
+    if entry['status'] == "Live":
+        return now + LIVE_INTERVAL
+    return None
+
+def getLeagueNextPollTime(games, now, schedule=()):
+    """Calculates when a league next needs to be polled. That's as soon as any of its games need to be.
+
+    Args:
+        games (list of GameRecord): The league's games from the last poll.
+        now (float): The current time, in seconds since the epoch.
+        schedule (list of dictionaries): The league's schedule, for leagues that fetch the details of each game separately.
+            Games in it without a record, ex. because their details couldn't be fetched, are still polled for from their start time.
+
+    Returns:
+        nextPoll (float): When to next poll the league, in seconds since the epoch.
+    """
+    pollTimes = [t for t in (getNextPollTime(game, now) for game in games) if t is not None]
+
+    gameIds = {game.gameId for game in games}
+    pollTimes += [t for t in (getScheduledPollTime(entry, now) for entry in schedule if entry['gameId'] not in gameIds) if t is not None]
+
+    # Nothing left to play, just check back for the next day's schedule.
+    if not pollTimes:
+        return now + IDLE_INTERVAL
+
+    return min(pollTimes)
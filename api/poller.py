@@ -0,0 +1,127 @@
+from api.gameData import fetchLeagueGames, combineGames, services
+from api.pollScheduler import getLeagueNextPollTime
+from api.gameDiff import diffGames, reuseUnchanged
+from collections import deque
+from util.metrics import metrics
+import threading
+import time
+
+# Number of seconds before retrying a league that failed to refresh.
+ERROR_INTERVAL = 30
+
+# Max number of attempts per league each poll. Failed leagues are retried on the next poll rather than holding up the others.
+POLL_ATTEMPTS = 3
+
+# Max number of change events held for the display loop. The oldest are dropped if it falls this far behind.
+MAX_PENDING_EVENTS = 256
+
+class Snapshot:
+    """Game data as of a single refresh. Never modified once published, so the display loop can read it without locking."""
+
+    def __init__(self, games, fetchedAt, error=None, events=()) -> None:
+        # Game records are frozen, so the snapshot only needs its own tuple of them to be read only.
+        self.games = tuple(games)
+        self.fetchedAt = fetchedAt
+        self.error = error
+
+        # What changed since the snapshot before this one.
+        self.events = tuple(events)
+
+        # Index the games so the display loop can swap in the latest version of a game mid cycle.
+        self.byId = {(game.league, game.gameId): game for game in self.games}
+
+    def getGame(self, game):
+        """Returns the version of a game in this snapshot, or None if the game isn't in it."""
+        return self.byId.get((game.league, game.gameId))
+
+class GamePoller(threading.Thread):
+    """Fetches game data in the background and publishes each result as a Snapshot.
+    The display loop only ever reads the latest snapshot, so it never waits on the network.
+
+    Each league is polled on its own schedule, worked out from the state of its games by the poll scheduler.
+    Leagues with live games are polled often, leagues with nothing on are barely polled at all.
+    """
+
+    def __init__(self, fetch=fetchLeagueGames) -> None:
+        super().__init__(daemon=True)
+        self.fetch = fetch
+        self.snapshot = None
+        self.ready = threading.Event()
+        self.stopped = threading.Event()
+
+        # Change events not yet taken by the display loop. Appending and popping are atomic, so no lock is needed.
+        self.events = deque(maxlen=MAX_PENDING_EVENTS)
+
+        # Total change events published, including any dropped before the display loop took them.
+        self.eventsPublished = 0
+
+        # Latest games and next poll time of each league. Every league is due right away.
+        self.leagueGames = {}
+        self.nextPoll = {league: 0 for league in services}
+
+    def run(self):
+        while not self.stopped.is_set():
+            now = time.time()
+            due = [league for league, nextPoll in self.nextPoll.items() if nextPoll <= now]
+
+            if due:
+                self.poll(due, now)
+
+            # Sleep until the next league is due.
+            self.stopped.wait(max(0, min(self.nextPoll.values()) - time.time()))
+
+    def poll(self, leagues, now):
+        """Fetches the given leagues, schedules their next polls, and publishes the result."""
+        error = None
+        try:
+            with metrics.timer('fetch'):
+                fetched = self.fetch(leagues, POLL_ATTEMPTS)
+        except Exception as e:
+            print('Poller Error')
+            print(e)
+            fetched = {}
+            error = e
+
+        for league in leagues:
+            if league in fetched:
+                self.leagueGames[league] = fetched[league]
+                self.nextPoll[league] = getLeagueNextPollTime(fetched[league], now, services[league].getSchedule())
+
+            # Keep showing the last games that were fetched, and try again soon.
+            else:
+                self.nextPoll[league] = now + ERROR_INTERVAL
+
+        fetchedAt = now if fetched else (self.snapshot.fetchedAt if self.snapshot else None)
+        previousGames = self.snapshot.games if self.snapshot else ()
+
+        # Unchanged games keep their old record, so anything keyed on a game's identity stays valid across refreshes.
+        games = reuseUnchanged(previousGames, combineGames(self.leagueGames))
+        events = diffGames(previousGames, games)
+
+        self.events.extend(events)
+        self.eventsPublished += len(events)
+        self.publish(Snapshot(games, fetchedAt, error, events))
+
+    def publish(self, snapshot):
+        # Swapping the reference is atomic, readers either see the old snapshot or the new one.
+        self.snapshot = snapshot
+        self.ready.set()
+
+    def getSnapshot(self):
+        """Returns the latest snapshot, or None if nothing has been fetched yet."""
+        return self.snapshot
+
+    def waitForSnapshot(self, timeout=None):
+        """Blocks until the first snapshot is published, then returns the latest one."""
+        self.ready.wait(timeout)
+        return self.snapshot
+
+    def takeEvents(self):
+        """Returns the change events published since the last call, oldest first."""
+        events = []
+        while self.events:
+            events.append(self.events.popleft())
+        return events
+
+    def stop(self):
+        self.stopped.set()
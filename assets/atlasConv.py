@@ -0,0 +1,47 @@
+import os
+import sys
+from PIL import Image
+
+# Run from the root of the repo: python3 assets/atlasConv.py
+sys.path.insert(0, os.getcwd())
+from util.assetAtlas import ATLAS_PATH, logoKey, writeAtlas
+from util.logoCache import LogoCache
+
+# Every size a logo is drawn at. Team logos are always 16x16, league logos vary by screen.
+TEAM_LOGO_SIZES = [(16,16)]
+LEAGUE_LOGO_SIZES = {
+    'nhl': [(22,22), (25,15), (40,30)],
+    'mlb': [(32,32), (20,30), (30,60)]
+}
+
+def main():
+    # Bakes all logos and fonts into a single atlas that the scoreboard maps at startup.
+    # Rerun whenever a logo or font is added or changed.
+    logoCache = LogoCache()
+    logos = {}
+    fonts = {}
+
+    for league in ['nhl', 'mlb']:
+        source = "assets/images/team logos/" + league + "/png/"
+        for filename in sorted(os.listdir(source)):
+            if filename.endswith('.png'):
+                abbreviation = filename[:-4]
+                for size in TEAM_LOGO_SIZES:
+                    logos[logoKey(league, abbreviation, size)] = logoCache.processLogo(league, abbreviation, size)
+
+        for size in LEAGUE_LOGO_SIZES[league]:
+            logos[logoKey(league, None, size)] = logoCache.processLogo(league, None, size)
+
+    source = "assets/fonts/PIL/"
+    for filename in sorted(os.listdir(source)):
+        if filename.endswith('.pil'):
+            name = filename[:-4]
+            with open(source + filename, 'rb') as fp:
+                metrics = fp.read()
+            fonts[name] = (metrics, Image.open(source + name + ".pbm"))
+
+    writeAtlas(ATLAS_PATH, logos, fonts)
+    print(f'Wrote {len(logos)} logos and {len(fonts)} fonts to {ATLAS_PATH}')
+
+if __name__ == '__main__':
+    main()
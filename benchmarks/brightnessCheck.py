@@ -0,0 +1,46 @@
+from datetime import datetime
+from util.brightnessSchedule import BrightnessSchedule, FakeSensor, MIN_BRIGHTNESS, MAX_BRIGHTNESS, buildSunTable
+from util import timeUtil
+import sys
+
+def checkHourlySchedule():
+    """Without a sensor, the schedule matches timeUtil.getMaxBrightness for every hour."""
+    schedule = BrightnessSchedule()
+    for hour in range(24):
+        expected = timeUtil.getMaxBrightness(hour)
+        assert schedule.get(datetime(2026, 6, 21, hour, 30)) == expected, f'hour {hour} should be {expected}'
+
+def checkSensorScaling():
+    """The sensor scales the table, is clamped to the min and max, and is ignored when it can't be read."""
+    schedule = BrightnessSchedule(sensor=FakeSensor([1, .5, 0, None, 2]))
+    noon = datetime(2026, 6, 21, 12, 0)
+    full, fullStep = timeUtil.getMaxBrightness(12)
+
+    assert schedule.get(noon) == (full, fullStep), 'full light should leave the table as is'
+    assert schedule.get(noon)[0] == full // 2, 'half light should halve the brightness'
+    assert schedule.get(noon)[0] == MIN_BRIGHTNESS, 'darkness should clamp to the minimum'
+    assert schedule.get(noon) == (full, fullStep), 'a failed reading should leave the table as is'
+    assert schedule.get(noon)[0] == MAX_BRIGHTNESS, 'readings above 1 should clamp to the maximum'
+
+def checkSunSchedule():
+    """With a location, it's dim overnight and bright at midday, whatever the timezone."""
+    schedule = BrightnessSchedule(lambda day: buildSunTable(day, 43.65, -79.38))
+    brightest = max(schedule.get(datetime(2026, 6, 21, hour))[0] for hour in range(24))
+    dimmest = min(schedule.get(datetime(2026, 6, 21, hour))[0] for hour in range(24))
+    assert brightest == MAX_BRIGHTNESS and dimmest == MIN_BRIGHTNESS, 'a summer day should reach both the max and min'
+
+def main():
+    # Run from the root of the repo: python3 -m benchmarks.brightnessCheck
+    # Drives the brightness schedule with a fake sensor. Exits non-zero if anything is off.
+    try:
+        checkHourlySchedule()
+        checkSensorScaling()
+        checkSunSchedule()
+    except AssertionError as e:
+        print(f'FAILED: {e}')
+        sys.exit(1)
+
+    print('OK: brightness schedule follows the table, sensor and sun')
+
+if __name__ == '__main__':
+    main()
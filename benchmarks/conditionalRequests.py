@@ -0,0 +1,64 @@
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from api.api import LeagueApiInterface
+from api.mlbService import MlbService
+import json
+import sys
+import threading
+
+# Minimal schedule with no games. The content doesn't matter, only whether it gets parsed.
+SCHEDULE = json.dumps({'dates': []}).encode('utf-8')
+ETAG = '"schedule-v1"'
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Serves the schedule with an ETag, and answers 304 when the client already has it."""
+
+    def do_GET(self):
+        if self.headers.get('If-None-Match') == ETAG:
+            self.send_response(304)
+            self.send_header('ETag', ETAG)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(SCHEDULE)))
+        self.send_header('ETag', ETAG)
+        self.end_headers()
+        self.wfile.write(SCHEDULE)
+
+    def log_message(self, format, *args):
+        pass
+
+def checkConditionalRequests(url):
+    """Polls the schedule twice. Raises AssertionError if the second, unchanged, poll is parsed again or doesn't reuse the first result."""
+    service = MlbService()
+    parses = LeagueApiInterface.jsonParses
+    notModified = LeagueApiInterface.notModified
+
+    first = service.fetchParsed(url, service.parseGameData)
+    assert LeagueApiInterface.jsonParses == parses + 1, 'first poll should parse the schedule once'
+    assert LeagueApiInterface.notModified == notModified, 'first poll has nothing to revalidate'
+
+    second = service.fetchParsed(url, service.parseGameData)
+    assert LeagueApiInterface.notModified == notModified + 1, 'second poll should be answered with 304 Not Modified'
+    assert LeagueApiInterface.jsonParses == parses + 1, 'unchanged schedule was parsed again'
+    assert second is first, 'cached result was not returned for the unchanged schedule'
+
+def main():
+    # Run from the root of the repo: python3 -m benchmarks.conditionalRequests
+    # Checks against a local stub server that polling an unchanged schedule costs a 304 and no JSON parse. Exits non-zero if it doesn't.
+    server = HTTPServer(('127.0.0.1', 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    try:
+        checkConditionalRequests(f'http://127.0.0.1:{server.server_port}/schedule')
+    except AssertionError as e:
+        print(f'FAILED: {e}')
+        sys.exit(1)
+    finally:
+        server.shutdown()
+
+    print('OK: unchanged schedule answered with 304, not parsed again, and the cached result reused')
+
+if __name__ == '__main__':
+    main()
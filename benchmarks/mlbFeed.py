@@ -0,0 +1,75 @@
+from api.mlbService import MlbService
+import gzip
+import json
+import os
+import statistics
+import sys
+import time
+
+# Holds a full feed and the matching slim feed for each game. The ones committed are synthetic, see benchmarks/fixtures/README.md.
+FIXTURE_DIR = "benchmarks/fixtures/mlb/"
+
+def record(service):
+    """Saves the full and slim live feed of every game on today's MLB schedule as fixtures."""
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+
+    schedule = service.fetch(service.BASE_URL + service.ENDPOINT_SCHEDULE)
+    with open(FIXTURE_DIR + "schedule.json", 'wb') as fp:
+        fp.write(schedule.content)
+
+    for game in service.parseGameData(schedule.json()):
+        if game['gameId'] == 'NO_GAMES':
+            continue
+        for kind, slim in [('full', False), ('slim', True)]:
+            feed = service.fetch(service.getFeedUrl(game['gameId'], slim))
+            with open(FIXTURE_DIR + f"{game['gameId']}.{kind}.json", 'wb') as fp:
+                fp.write(feed.content)
+        print(f"Recorded {game['gameId']} ({game['status']})")
+
+def measure(service, path, runs):
+    """Returns the size of a recorded feed, its gzipped size, and the median seconds to parse it into game details."""
+    with open(path, 'rb') as fp:
+        content = fp.read()
+
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        service.parseGameDetails(0, json.loads(content))
+        times.append(time.perf_counter() - start)
+
+    return len(content), len(gzip.compress(content)), statistics.median(times)
+
+def main():
+    # Run from the root of the repo.
+    #   python3 -m benchmarks.mlbFeed --record    Records today's feeds as fixtures.
+    #   python3 -m benchmarks.mlbFeed [runs]      Compares the full and slim feeds of the recorded fixtures.
+    service = MlbService()
+
+    if len(sys.argv) > 1 and sys.argv[1] == '--record':
+        record(service)
+        return
+
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    gameIds = sorted({f.split('.')[0] for f in os.listdir(FIXTURE_DIR) if f.endswith('.full.json')}) if os.path.isdir(FIXTURE_DIR) else []
+    if not gameIds:
+        print(f'No fixtures in {FIXTURE_DIR}, record some with --record')
+        return
+
+    print(f'Comparing the feeds in {FIXTURE_DIR}. The committed ones are synthetic, so only feeds recorded with --record give realistic numbers.')
+    print(f'{"game":<10}{"full KB":>10}{"full gz KB":>12}{"full ms":>10}{"slim KB":>10}{"slim gz KB":>12}{"slim ms":>10}')
+    totals = [0] * 6
+    for gameId in gameIds:
+        # Games that can't be shown yet (ex. not started or postponed) fail to parse either way, so there's nothing to compare.
+        with open(FIXTURE_DIR + f'{gameId}.full.json', 'rb') as fp:
+            if service.parseGameDetails(0, json.loads(fp.read())) is None:
+                print(f'{gameId:<10}skipped, not shown')
+                continue
+
+        row = measure(service, FIXTURE_DIR + f'{gameId}.full.json', runs) + measure(service, FIXTURE_DIR + f'{gameId}.slim.json', runs)
+        totals = [t + r for t, r in zip(totals, row)]
+        print(f'{gameId:<10}{row[0] / 1024:>10.1f}{row[1] / 1024:>12.1f}{row[2] * 1000:>10.2f}{row[3] / 1024:>10.1f}{row[4] / 1024:>12.1f}{row[5] * 1000:>10.2f}')
+
+    print(f'{"total":<10}{totals[0] / 1024:>10.1f}{totals[1] / 1024:>12.1f}{totals[2] * 1000:>10.2f}{totals[3] / 1024:>10.1f}{totals[4] / 1024:>12.1f}{totals[5] * 1000:>10.2f}')
+
+if __name__ == '__main__':
+    main()
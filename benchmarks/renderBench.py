@@ -0,0 +1,278 @@
+from PIL import Image, ImageDraw
+from api.fixtures import FixtureSession
+from api.mlbService import MlbService
+from api.nhlService import NhlService
+from renderers.nhlGameRenderer import NhlGameRenderer
+from renderers.mlbGameRenderer import MlbGameRenderer
+from renderers.textCache import textCache
+from urllib.parse import urlsplit
+import argparse
+import copy
+import functools
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+# Every screen each renderer can build.
+BUILD_METHODS = ['buildGameNotStarted', 'buildGameInProgress', 'buildGameOver', 'buildGamePostponed', 'buildNoGames']
+
+# Small synthetic responses committed with the repo, so the benchmark runs anywhere. See the README in it for what they cover.
+# Good for comparing runs against a baseline, but record real responses for numbers that reflect the live APIs.
+FIXTURE_DIR = "benchmarks/fixtures"
+
+class CountingDraw:
+    """Wraps a draw object, counting every call made through it."""
+
+    def __init__(self, draw) -> None:
+        self.draw = draw
+        self.calls = 0
+
+    def __getattr__(self, name):
+        attr = getattr(self.draw, name)
+        if not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            self.calls += 1
+            return attr(*args, **kwargs)
+        return call
+
+def measure(function, runs, setup=None):
+    """Times a function over a number of runs, then measures its allocations on one more run.
+
+    Returns:
+        result (dict): Median and max milliseconds per call, and KB and blocks allocated by a single call.
+    """
+    times = []
+    for _ in range(runs):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+
+    if setup:
+        setup()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    function()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    stats = after.compare_to(before, 'filename')
+
+    return {
+        'medianMs': statistics.median(times) * 1000,
+        'maxMs': max(times) * 1000,
+        'allocKb': sum(s.size_diff for s in stats if s.size_diff > 0) / 1024,
+        'allocBlocks': sum(s.count_diff for s in stats if s.count_diff > 0)
+    }
+
+def loadFixtures(directory):
+    """Sorts the responses recorded with --record into NHL teams, NHL schedules, MLB schedules, and full and slim MLB feeds."""
+    session = FixtureSession(directory)
+    fixtures = {'nhlTeams': [], 'nhlSchedule': [], 'mlbSchedule': [], 'mlbFeed': [], 'mlbSlimFeed': []}
+
+    for url, filename in session.index.items():
+        with open(os.path.join(directory, filename), 'rb') as fp:
+            content = fp.read()
+
+        parts = urlsplit(url)
+        if 'nhl' in parts.netloc:
+            kind = 'nhlTeams' if parts.path.endswith('/teams') else 'nhlSchedule'
+        elif '/feed/live' in parts.path:
+            kind = 'mlbSlimFeed' if 'fields=' in parts.query else 'mlbFeed'
+        else:
+            kind = 'mlbSchedule'
+        fixtures[kind].append((url, content))
+
+    return fixtures
+
+def benchmarkParsing(fixtures, runs):
+    """Times each service parsing its recorded responses. Returns the results, plus the parsed games to render."""
+    results = {}
+    nhlService = NhlService()
+    mlbService = MlbService()
+    nhlGames = []
+    mlbGames = []
+
+    # The teams list is cached to disk, so it may not have been requested while recording.
+    if fixtures['nhlTeams']:
+        url, content = fixtures['nhlTeams'][0]
+        results['parse nhl teams'] = measure(lambda: nhlService.indexTeams(json.loads(content)['teams']), runs)
+        teams = nhlService.indexTeams(json.loads(content)['teams'])
+    else:
+        nhlService.loadTeamCache()
+        teams = nhlService.teams
+
+    for url, content in fixtures['nhlSchedule']:
+        if teams is None:
+            print('Skipping NHL schedule, no teams recorded or cached')
+            break
+        results['parse nhl schedule'] = measure(lambda: nhlService.parseGameData(json.loads(content), teams), runs)
+        nhlGames = nhlService.parseGameData(json.loads(content), teams)
+
+    for url, content in fixtures['mlbSchedule']:
+        results['parse mlb schedule'] = measure(lambda: mlbService.parseGameData(json.loads(content)), runs)
+
+    feedResults = []
+    for url, content in fixtures['mlbFeed']:
+        gameId = int(urlsplit(url).path.split('/')[-3])
+        feedResults.append(measure(lambda: mlbService.parseGameDetails(gameId, json.loads(content)), runs))
+        game = mlbService.parseGameDetails(gameId, json.loads(content))
+        if game is not None:
+            mlbGames.append(game)
+
+    # Feeds are summed across games, that's what a refresh costs.
+    if feedResults:
+        results['parse mlb feeds'] = {key: sum(r[key] for r in feedResults) for key in feedResults[0]}
+
+    # Slim feeds are timed on their own. They're the same games as the full feeds, so they aren't rendered again.
+    slimResults = []
+    for url, content in fixtures['mlbSlimFeed']:
+        gameId = int(urlsplit(url).path.split('/')[-3])
+        slimResults.append(measure(lambda: mlbService.parseGameDetails(gameId, json.loads(content)), runs))
+
+    if slimResults:
+        results['parse mlb slim feeds'] = {key: sum(r[key] for r in slimResults) for key in slimResults[0]}
+
+    return results, nhlGames, mlbGames
+
+def getBuildCalls(renderer, games):
+    """Sorts games by the build method the renderer picks for them, using the renderer's own buildFrame.
+
+    Returns:
+        calls (dict): Maps each build method to calls that build a screen with it. buildNoGames doesn't need a game, so it's always called once.
+    """
+    calls = {method: [] for method in BUILD_METHODS}
+    calls['buildNoGames'].append(renderer.buildNoGames)
+
+    # A copy of the renderer whose build methods only note which one was picked.
+    picked = []
+    stub = copy.copy(renderer)
+    for method in BUILD_METHODS:
+        setattr(stub, method, lambda *args, method=method: picked.append(method))
+
+    for game in games:
+        picked.clear()
+        type(renderer).buildFrame(stub, game)
+        if picked[0] != 'buildNoGames':
+            calls[picked[0]].append(functools.partial(getattr(renderer, picked[0]), game))
+
+    return calls
+
+def benchmarkRendering(nhlGames, mlbGames, runs):
+    """Times every build method of both renderers against every game the renderer would use it for.
+    Methods that no game uses are left out. Any error building a screen is raised, rather than leaving the screen out.
+    """
+    results = {}
+    image = Image.new("RGB", (64, 32))
+    draw = ImageDraw.Draw(image)
+    clear = lambda: draw.rectangle(((0,0),(63,31)), fill=(0,0,0,255))
+
+    for league, renderer, games in [('nhl', NhlGameRenderer(None, image, draw), nhlGames), ('mlb', MlbGameRenderer(None, image, draw), mlbGames)]:
+        for method, calls in getBuildCalls(renderer, games).items():
+            methodResults = []
+            for call in calls:
+                # Build once first, so loading logos and fonts isn't timed.
+                clear()
+                call()
+                methodResults.append(measure(call, runs, clear))
+
+            if methodResults:
+                results[f'{league} {method}'] = {
+                    'medianMs': statistics.median(r['medianMs'] for r in methodResults),
+                    'maxMs': max(r['maxMs'] for r in methodResults),
+                    'allocKb': max(r['allocKb'] for r in methodResults),
+                    'allocBlocks': max(r['allocBlocks'] for r in methodResults)
+                }
+
+    return results
+
+def countDrawCalls(nhlGames, mlbGames):
+    """Counts the draw calls and pastes each build method makes per slide, without the text cache and then with it warmed up.
+
+    Returns:
+        counts (dict): Maps each build method to the most calls made for any one game, before and after.
+    """
+    counts = {}
+    image = Image.new("RGB", (64, 32))
+    draw = CountingDraw(ImageDraw.Draw(image))
+
+    def countCalls(call):
+        # Logo pastes are the same either way, so only draw calls and text pastes are counted.
+        draw.rectangle(((0,0),(63,31)), fill=(0,0,0,255))
+        draw.calls = 0
+        pastes = textCache.pastes
+        call()
+        return draw.calls + textCache.pastes - pastes
+
+    for league, renderer, games in [('nhl', NhlGameRenderer(None, image, draw), nhlGames), ('mlb', MlbGameRenderer(None, image, draw), mlbGames)]:
+        for method, calls in getBuildCalls(renderer, games).items():
+            before = after = None
+            for call in calls:
+                try:
+                    textCache.enabled = False
+                    uncached = countCalls(call)
+                finally:
+                    textCache.enabled = True
+
+                # Warm the cache up, then count.
+                countCalls(call)
+                before = max(before or 0, uncached)
+                after = max(after or 0, countCalls(call))
+
+            if before is not None:
+                counts[f'{league} {method}'] = {'before': before, 'after': after}
+
+    return counts
+
+def main():
+    # Run from the root of the repo: python3 -m benchmarks.renderBench [FIXTURES_DIR]
+    # Other fixtures can be recorded with: python3 rpi-led-nhl-scoreboard.py --record FIXTURES_DIR --cycles 1
+    parser = argparse.ArgumentParser(description="Benchmarks parsing and rendering against recorded API responses.")
+    parser.add_argument('fixtures', nargs='?', default=FIXTURE_DIR, help=f"Directory of responses recorded with --record. Defaults to {FIXTURE_DIR}.")
+    parser.add_argument('--runs', type=int, default=50, help="Number of timed runs per stage.")
+    parser.add_argument('--save', help="Save the results to this file, to use as a baseline later.")
+    parser.add_argument('--baseline', help="Compare against results saved with --save. Exits non-zero if any stage regressed.")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="How much slower than the baseline a stage can be before it counts as a regression.")
+    args = parser.parse_args()
+
+    fixtures = loadFixtures(args.fixtures)
+    results, nhlGames, mlbGames = benchmarkParsing(fixtures, args.runs)
+    results.update(benchmarkRendering(nhlGames, mlbGames, args.runs))
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as fp:
+            baseline = json.load(fp)
+
+    # A stage in the baseline that's missing now means a screen stopped being built, which counts as a regression.
+    regressions = [stage for stage in baseline if stage not in results]
+    print(f'{"stage":<32}{"median ms":>11}{"max ms":>10}{"alloc KB":>10}{"blocks":>8}{"vs base":>9}')
+    for stage, result in results.items():
+        change = ''
+        if stage in baseline:
+            ratio = result['medianMs'] / baseline[stage]['medianMs'] - 1 if baseline[stage]['medianMs'] else 0
+            change = f'{ratio:+.0%}'
+            if ratio > args.tolerance:
+                regressions.append(stage)
+        print(f"{stage:<32}{result['medianMs']:>11.3f}{result['maxMs']:>10.3f}{result['allocKb']:>10.1f}{result['allocBlocks']:>8}{change:>9}")
+
+    print()
+    print(f'{"draw calls per slide":<32}{"uncached":>11}{"cached":>10}')
+    for stage, count in countDrawCalls(nhlGames, mlbGames).items():
+        print(f"{stage:<32}{count['before']:>11}{count['after']:>10}")
+
+    if args.save:
+        with open(args.save, 'w') as fp:
+            json.dump(results, fp, indent=2)
+
+    if regressions:
+        print('Regressed: ' + ', '.join(regressions))
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+import json
+import resource
+import statistics
+import subprocess
+import sys
+import time
+
+# Fonts the renderers used to load in CommonRenderer.__init__, and the ones the main script loaded on top of those.
+RENDERER_FONTS = ["Tamzen5x9r", "Tamzen5x9b", "Tamzen6x12r", "Tamzen6x12b", "Tamzen8x15r", "Tamzen8x15b", "MonteCarloBold", "MonteCarloMedium", "4x6"]
+MAIN_FONTS = ["Tamzen5x9r", "Tamzen5x9b", "Tamzen6x12r", "Tamzen6x12b", "Tamzen8x15r", "Tamzen8x15b"]
+
+def firstFrame(mode):
+    """Imports everything and renders the first frame. Returns the elapsed seconds and peak RSS in KB."""
+    start = time.perf_counter()
+
+    from PIL import Image, ImageDraw, ImageFont
+    from renderers.nhlGameRenderer import NhlGameRenderer
+    from renderers.mlbGameRenderer import MlbGameRenderer
+    from util.fontRegistry import fontRegistry
+    from api.gameRecords import noGames
+
+    if mode == 'perFile':
+        # What startup used to do: every renderer loads every font, then the main script loads six of them again.
+        for _ in range(2):
+            for name in RENDERER_FONTS:
+                fontRegistry.fonts[name] = ImageFont.load("assets/fonts/PIL/" + name + ".pil")
+        for name in MAIN_FONTS:
+            ImageFont.load("assets/fonts/PIL/" + name + ".pil")
+
+    image = Image.new("RGB", (64, 32))
+    draw = ImageDraw.Draw(image)
+    nhlRenderer = NhlGameRenderer(None, image, draw)
+    mlbRenderer = MlbGameRenderer(None, image, draw)
+
+    # The scoreboard sets up both renderers before its first rotation, so both are timed.
+    nhlRenderer.render(noGames('nhl'))
+    mlbRenderer.render(noGames('mlb'))
+
+    return time.perf_counter() - start, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+def main():
+    # Run from the root of the repo: python3 -m benchmarks.startup [runs]
+    # Each run is a fresh interpreter so import time and RSS aren't skewed by earlier runs.
+    if len(sys.argv) > 2 and sys.argv[1] == '--child':
+        seconds, rss = firstFrame(sys.argv[2])
+        print(json.dumps({'seconds': seconds, 'rss': rss}))
+        return
+
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    print(f'{"mode":<10}{"first frame (ms)":>18}{"peak RSS (KB)":>16}')
+    for mode in ['perFile', 'registry']:
+        results = []
+        for _ in range(runs):
+            output = subprocess.run([sys.executable, '-m', 'benchmarks.startup', '--child', mode], stdout=subprocess.PIPE, check=True).stdout
+            results.append(json.loads(output.decode('utf-8').splitlines()[-1]))
+
+        seconds = statistics.median(r['seconds'] for r in results)
+        rss = statistics.median(r['rss'] for r in results)
+        print(f'{mode:<10}{seconds * 1000:>18.1f}{rss:>16.0f}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+import time
+
+class DisplayInterface:
+    """Somewhere to show the image object. The scoreboard only talks to the display through this, so it can run with or without a matrix attached."""
+
+    def __init__(self, width, height) -> None:
+        self.width = width
+        self.height = height
+
+    def show(self, image, brightness):
+        """Shows the image at the given brightness (0-100).
+
+        Args:
+            image (Image): The image to show. Only re-read after invalidate is called.
+            brightness (int): Brightness to show the image at.
+        """
+        pass
+
+    def showFrame(self, image, brightness):
+        """Shows an image that changes every frame, ex. a transition or the ticker. Nothing about it is kept for reuse."""
+        self.invalidate()
+        self.show(image, brightness)
+
+    def showBlank(self):
+        """Shows a totally blank screen."""
+        pass
+
+    def invalidate(self):
+        """Lets the display know the image has changed since it was last shown."""
+        pass
+
+    def sleep(self, seconds):
+        """Holds what's currently shown for the given number of seconds."""
+        time.sleep(seconds)
+
+    def close(self):
+        """Called once the scoreboard is done with the display."""
+        pass
+
+def createDisplay(kind, width, height, output=None, chainLength=1, parallel=1):
+    """Creates the display the scoreboard will run on.
+
+    Args:
+        kind (string): 'matrix' for the LED matrix, 'memory' to keep frames in memory, or 'png'/'gif' to write frames to files.
+        width (int): Width of the display in pixels.
+        height (int): Height of the display in pixels.
+        output (string): Directory that the png and gif displays write to.
+        chainLength (int): Number of panels chained side by side. Only used by the matrix.
+        parallel (int): Number of chains stacked on top of each other. Only used by the matrix.
+
+    Returns:
+        display (DisplayInterface): The display.
+    """
+    # Imported here so the matrix library is only needed when there's a matrix.
+    if kind == 'matrix':
+        from display.matrixDisplay import MatrixDisplay
+        return MatrixDisplay(width, height, chainLength, parallel)
+
+    if kind == 'memory':
+        from display.memoryDisplay import MemoryDisplay
+        return MemoryDisplay(width, height)
+
+    if kind in ('png', 'gif'):
+        from display.fileDisplay import FileDisplay
+        return FileDisplay(width, height, output or "output", kind)
+
+    raise ValueError(f'Unknown display: {kind}')
@@ -0,0 +1,40 @@
+from display.memoryDisplay import MemoryDisplay
+from PIL import Image
+import os
+
+class FileDisplay(MemoryDisplay):
+    """Records everything shown like MemoryDisplay, then writes it out on close.
+    'png' writes each distinct frame as a PNG, 'gif' writes the whole run as an animated GIF with brightness applied.
+    """
+
+    def __init__(self, width, height, output, kind) -> None:
+        super().__init__(width, height)
+        self.output = output
+        self.kind = kind
+
+    def close(self):
+        os.makedirs(self.output, exist_ok=True)
+
+        if self.kind == 'png':
+            for i, frame in enumerate(self.frames):
+                frame.save(os.path.join(self.output, f'frame_{i:04d}.png'))
+            print(f'Wrote {len(self.frames)} frames to {self.output}')
+            return
+
+        if not self.events:
+            return
+
+        blank = Image.new("RGB", (self.width, self.height))
+        images = []
+        durations = []
+        for i, (seconds, frame, brightness) in enumerate(self.events):
+            image = blank if frame is None else self.frames[frame].point(lambda p: p * brightness // 100)
+            images.append(image)
+
+            # Each image stays up until the next one is shown. The last one gets a second.
+            end = self.events[i + 1][0] if i + 1 < len(self.events) else seconds + 1
+            durations.append(max(20, int((end - seconds) * 1000)))
+
+        path = os.path.join(self.output, 'scoreboard.gif')
+        images[0].save(path, save_all=True, append_images=images[1:], duration=durations, loop=0)
+        print(f'Wrote {len(images)} images to {path}')
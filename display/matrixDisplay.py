@@ -0,0 +1,94 @@
+from rgbmatrix import RGBMatrix, RGBMatrixOptions
+from display.display import DisplayInterface
+from util.metrics import metrics
+
+class MatrixDisplay(DisplayInterface):
+    """The LED matrix. Frames are drawn to offscreen canvases and swapped in on vsync.
+
+    The matrix applies brightness as pixels are written, so each brightness level gets its own offscreen canvas.
+    A canvas is only redrawn when the image has changed since it was last drawn.
+
+    width and height are of the whole wall of panels. Each panel is width / chainLength by height / parallel.
+    """
+
+    def __init__(self, width, height, chainLength=1, parallel=1) -> None:
+        super().__init__(width, height)
+
+        # Configure options for the matrix
+        options = RGBMatrixOptions()
+        options.rows = height // parallel
+        options.cols = width // chainLength
+        options.chain_length = chainLength
+        options.parallel = parallel
+        options.gpio_slowdown= 2
+        options.hardware_mapping = 'adafruit-hat'
+
+        # Define a matrix object from the options.
+        self.matrix = RGBMatrix(options = options)
+
+        # imageVersion changes whenever the image does, so each canvas knows if it needs to be redrawn.
+        self.canvases = {}
+        self.canvasVersions = {}
+        self.imageVersion = 0
+        self.blankCanvas = None
+
+        # Two canvases that don't belong to any brightness level. Frames are drawn to whichever isn't on screen, then swapped in.
+        self.spareCanvases = [self.matrix.CreateFrameCanvas(), self.matrix.CreateFrameCanvas()]
+
+        # The canvas currently on screen. Nothing is ever drawn into it.
+        self.onScreen = None
+
+    def show(self, image, brightness):
+        canvas = self.canvases.get(brightness)
+
+        if self.canvasVersions.get(brightness) != self.imageVersion:
+            if canvas is None:
+                canvas = self.matrix.CreateFrameCanvas()
+
+            # The canvas for this brightness is on screen, so draw into a spare instead.
+            # The spare takes over this brightness, and the canvas on screen becomes a spare once it's swapped out.
+            elif canvas is self.onScreen:
+                spare = self.getSpareCanvas()
+                self.spareCanvases[self.spareCanvases.index(spare)] = canvas
+                canvas = spare
+
+            with metrics.timer('upload'):
+                canvas.brightness = brightness
+                canvas.SetImage(image)
+            self.canvases[brightness] = canvas
+            self.canvasVersions[brightness] = self.imageVersion
+
+        self.swap(canvas)
+
+    def showFrame(self, image, brightness):
+        canvas = self.getSpareCanvas()
+        with metrics.timer('upload'):
+            canvas.brightness = brightness
+            canvas.SetImage(image)
+        self.swap(canvas)
+
+        # The frame may have been the image, so the other canvases can't be trusted to match it anymore.
+        self.invalidate()
+
+    def showBlank(self):
+        # Uses a canvas that was cleared once and never drawn to.
+        if self.blankCanvas is None:
+            self.blankCanvas = self.matrix.CreateFrameCanvas()
+            self.blankCanvas.Clear()
+
+        self.swap(self.blankCanvas)
+
+    def invalidate(self):
+        self.imageVersion += 1
+
+    def getSpareCanvas(self):
+        """Returns the spare canvas that isn't on screen."""
+        return next(canvas for canvas in self.spareCanvases if canvas is not self.onScreen)
+
+    def swap(self, canvas):
+        """Puts the canvas on screen at the next vsync.
+        The canvas handed back by SwapOnVSync is whatever was on screen before, which may belong to a brightness level or be the blank canvas, so it isn't drawn into.
+        """
+        if canvas is not self.onScreen:
+            self.matrix.SwapOnVSync(canvas)
+            self.onScreen = canvas
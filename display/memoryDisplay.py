@@ -0,0 +1,49 @@
+from display.display import DisplayInterface
+from util.metrics import metrics
+import time
+
+class MemoryDisplay(DisplayInterface):
+    """Keeps everything that would've been shown in memory. Nothing is attached and nothing waits, time spent holding the screen is only counted.
+
+    frames holds a copy of each distinct image shown. events holds a (seconds, frame index, brightness) tuple for everything shown,
+    where seconds is the time since the display was created, including any held time. A frame index of None is a blank screen.
+    """
+
+    def __init__(self, width, height) -> None:
+        super().__init__(width, height)
+        self.frames = []
+        self.events = []
+        self.uploads = 0
+        self.heldSeconds = 0
+        self.start = time.perf_counter()
+        self.changed = True
+
+    def now(self):
+        return time.perf_counter() - self.start + self.heldSeconds
+
+    def show(self, image, brightness):
+        # Only copy the image if it's changed since it was last shown.
+        if self.changed:
+            with metrics.timer('upload'):
+                self.frames.append(image.copy())
+            self.uploads += 1
+            self.changed = False
+
+        self.events.append((self.now(), len(self.frames) - 1, brightness))
+
+    def showBlank(self):
+        self.events.append((self.now(), None, 0))
+
+    def invalidate(self):
+        self.changed = True
+
+    def sleep(self, seconds):
+        self.heldSeconds += seconds
+
+    def getBrightnessChanges(self):
+        """Returns each (seconds, brightness) where the brightness differs from what was shown before it."""
+        changes = []
+        for seconds, frame, brightness in self.events:
+            if not changes or changes[-1][1] != brightness:
+                changes.append((seconds, brightness))
+        return changes
@@ -1,28 +1,33 @@
 from PIL import Image, ImageDraw, ImageFont
-from util import imageUtil
-import math
+from util.fontRegistry import FontAttribute
+from util.logoCache import logoCache
+from renderers.frameCache import frameCache
+from renderers.textCache import textCache
+from util.metrics import metrics
 
 class CommonRenderer: 
 
+    # Declare fonts that are used throughout. These are shared by all renderers and only loaded on first use.
+    fontSmallReg = FontAttribute("Tamzen5x9r")
+    fontSmallBold = FontAttribute("Tamzen5x9b")
+    fontMedReg = FontAttribute("Tamzen6x12r")
+    fontMedBold = FontAttribute("Tamzen6x12b")
+    fontLargeReg = FontAttribute("Tamzen8x15r")
+    fontLargeBold = FontAttribute("Tamzen8x15b")
+
+    fontMonteBold = FontAttribute("MonteCarloBold")
+    fontMonteReg = FontAttribute("MonteCarloMedium")
+
+    fontXsReg = FontAttribute("4x6")
+
+    # Fields of a game that affect what's drawn. Set by each league's renderer.
+    RENDER_FIELDS = ()
+
     def __init__(self, matrix, image, draw) -> None:
             super().__init__()
             self.matrix = matrix
             self.image = image
             self.draw = draw
-            # Declare fonts that are used throughout.
-            self.fontSmallReg = ImageFont.load("assets/fonts/PIL/Tamzen5x9r.pil")
-            self.fontSmallBold = ImageFont.load("assets/fonts/PIL/Tamzen5x9b.pil")
-            self.fontMedReg = ImageFont.load("assets/fonts/PIL/Tamzen6x12r.pil")
-            self.fontMedBold = ImageFont.load("assets/fonts/PIL/Tamzen6x12b.pil")
-            self.fontLargeReg = ImageFont.load("assets/fonts/PIL/Tamzen8x15r.pil")
-            self.fontLargeBold = ImageFont.load("assets/fonts/PIL/Tamzen8x15b.pil")
-
-            self.fontMonteBold = ImageFont.load("assets/fonts/PIL/MonteCarloBold.pil")
-            self.fontMonteReg = ImageFont.load("assets/fonts/PIL/MonteCarloMedium.pil")
-
-            self.fontXsReg = ImageFont.load("assets/fonts/PIL/4x6.pil")
-
-
             # Declare text colours that are needed.
             self.fillWhite = 255,255,255,255
             self.fillBlack = 0,0,0,255
@@ -32,6 +37,49 @@ class CommonRenderer:
             # i.e. the first col you can use without worry of logo overlap.
             self.firstMiddleCol = 21
 
+    def render(self, game):
+        """Adds the screen for a game to the image object. Reuses the last frame drawn for the game if nothing shown on it has changed.
+        The image object is a single panel, the layout decides where on the wall it goes.
+
+        Args:
+            game (GameRecord): All information for a specific game.
+        """
+        with metrics.timer('render'):
+            key = self.getFrameKey(game)
+
+            frame = frameCache.get(key)
+            if frame is not None:
+                self.image.paste(frame)
+                return
+
+            # The image is shared by every game, so start from blank.
+            self.draw.rectangle(((0, 0), (self.image.width - 1, self.image.height - 1)), fill=self.fillBlack)
+            self.buildFrame(game)
+            frameCache.put(key, self.image.copy())
+
+    def renderHighlight(self, game, scoringTeams):
+        """Adds the screen for a game to the image object, with the rows of the teams that just scored outlined.
+
+        Args:
+            game (GameRecord): All information for a specific game.
+            scoringTeams (list of strings): 'home' and/or 'away'.
+        """
+        # The outline is drawn after rendering, so the cached frame stays clean.
+        self.render(game)
+
+        half = self.image.height // 2
+        for team in scoringTeams:
+            top = 0 if team == 'away' else half
+            self.draw.rectangle(((0, top), (self.image.width - 1, top + half - 1)), outline=self.fillRed)
+
+    def getFrameKey(self, game):
+        """Returns a hashable key made of the league and every field of the game that affects what's drawn."""
+        return (game.league, game.gameId) + tuple(getattr(game, field, None) for field in self.RENDER_FIELDS)
+
+    def buildFrame(self, game):
+        """Adds all aspects of the game's screen to the image object. Implemented by each league's renderer."""
+        pass
+
     def displayLogos(self, league, awayTeam, homeTeam):
         """Adds the logos of the home and away teams to the image object, making sure to not overlap text and center logos.
 
@@ -43,25 +91,42 @@ class CommonRenderer:
         # Difine the max width and height that a logo can be.
         logoSize = (16,16)
 
-        # Load, crop, and resize the away team logo.
-        awayLogo = Image.open("assets/images/team logos/" + league + "/png/" + awayTeam + ".png")
-        awayLogo = imageUtil.cropImage(awayLogo)
-        awayLogo.thumbnail(logoSize)
-
-        # Load, crop, and resize the home team logo.
-        homeLogo = Image.open("assets/images/team logos/" + league + "/png/" + homeTeam + ".png")
-        homeLogo = imageUtil.cropImage(homeLogo)
-        homeLogo.thumbnail(logoSize)
-
-        awayLogoWidth, awayLogoHeight = awayLogo.size
-        homeLogoWidth, homeLogoHeight = homeLogo.size
+        # Get the cropped and resized logos of both teams.
+        awayLogo = logoCache.getLogo(league, awayTeam, logoSize)
+        homeLogo = logoCache.getLogo(league, homeTeam, logoSize)
 
         # Add the logos to the image.
         # Logos will be bounded by the text region, and be centered vertically.
-        self.image.paste(awayLogo, ((10 - math.floor(awayLogoWidth / 2)), 8 - math.ceil(awayLogoHeight / 2)))
-        self.image.paste(homeLogo, ((10 - math.floor(homeLogoWidth / 2)), 24 - math.floor(homeLogoHeight / 2)))
+        self.image.paste(awayLogo.image, (10 - awayLogo.offsetX, 8 - awayLogo.offsetTop))
+        self.image.paste(homeLogo.image, (10 - homeLogo.offsetX, 24 - homeLogo.offsetBottom))
+
+    def drawText(self, xy, text, font, fill):
+        """Draws text that comes up often (labels, scores, times) from the text cache. Use draw.text for one-off text like names."""
+        textCache.drawText(self.image, self.draw, xy, text, font, fill)
+
+    def drawRun(self, xy, key, fill, build):
+        """Draws a run made of several pieces from the text cache. build draws the whole run given a draw object, origin and fill."""
+        textCache.drawRun(self.image, self.draw, xy, key, fill, build)
+
+    def drawPieces(self, xy, pieces, fill):
+        """Draws text made of several pieces as a single cached run.
+
+        Args:
+            xy (tuple): Point the run is drawn at.
+            pieces (tuple): Each piece is a tuple of x offset, y offset, text and font.
+            fill (tuple): Colour of the run.
+        """
+        def build(draw, origin, runFill):
+            for offsetX, offsetY, text, font in pieces:
+                draw.text((origin[0] + offsetX, origin[1] + offsetY), text, font=font, fill=runFill)
+
+        self.drawRun(xy, ('pieces', pieces), fill, build)
 
     def displayTime(self, time: str, rootPos: tuple):
+        # Hours, the colon and minutes are drawn separately, so cache the whole time as one run.
+        self.drawRun(rootPos, ('time', time), self.fillWhite, lambda draw, origin, fill: self.buildTime(draw, origin, time, fill))
+
+    def buildTime(self, draw, rootPos, time, fill):
         posX, posY = rootPos
         hrs, mins = time.split(':')
         mins, *ampm = mins.split(' ')
@@ -71,12 +136,12 @@ class CommonRenderer:
         if len(hrs) > 1 and int(hrs) <= 9:
             spacer = spacer + 5        
 
-        self.draw.text((posX + 1, posY), f'{hrs}', font=self.fontSmallReg, fill=self.fillWhite)
+        draw.text((posX + 1, posY), f'{hrs}', font=self.fontSmallReg, fill=fill)
 
-        self.draw.rectangle(((posX + spacer + 5, posY + 3),(posX + spacer + 5, posY + 3)), fill=self.fillWhite)
-        self.draw.rectangle(((posX + spacer + 5, posY + 5),(posX + spacer + 5, posY + 5)), fill=self.fillWhite)
+        draw.rectangle(((posX + spacer + 5, posY + 3),(posX + spacer + 5, posY + 3)), fill=fill)
+        draw.rectangle(((posX + spacer + 5, posY + 5),(posX + spacer + 5, posY + 5)), fill=fill)
 
-        self.draw.text((posX + spacer + 7, posY), f'{mins}', font=self.fontSmallReg, fill=self.fillWhite)
+        draw.text((posX + spacer + 7, posY), f'{mins}', font=self.fontSmallReg, fill=fill)
 
         if ampm:
-            self.draw.text((posX + spacer + 18, posY), f'{ampm[0]}', font=self.fontSmallReg, fill=self.fillWhite)
+            draw.text((posX + spacer + 18, posY), f'{ampm[0]}', font=self.fontSmallReg, fill=fill)
@@ -0,0 +1,44 @@
+from collections import OrderedDict
+
+class FrameCache:
+    """Keeps rendered frames so a game that hasn't changed since it was last drawn is just a copy of the old frame.
+
+    Frames are keyed on the fields of the game that affect what's drawn. The least recently used frame is dropped once maxEntries is reached.
+    """
+
+    def __init__(self, maxEntries=64) -> None:
+        self.maxEntries = maxEntries
+        self.frames = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """Returns the frame for the key, or None if it hasn't been rendered."""
+        frame = self.frames.get(key)
+        if frame is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.frames.move_to_end(key)
+        return frame
+
+    def put(self, key, frame):
+        self.frames[key] = frame
+        self.frames.move_to_end(key)
+
+        # Evict the least recently used frame if over the limit.
+        if len(self.frames) > self.maxEntries:
+            self.frames.popitem(last=False)
+
+    def discardGame(self, league, gameId):
+        """Drops every frame of a game. Used once a game has changed, since its old frames won't be shown again."""
+        for key in [key for key in self.frames if key[:2] == (league, gameId)]:
+            del self.frames[key]
+
+    def getStats(self):
+        """Returns the number of hits and misses so far, and the number of frames held."""
+        return {'hits': self.hits, 'misses': self.misses, 'frames': len(self.frames)}
+
+# Shared by all renderers.
+frameCache = FrameCache()
@@ -0,0 +1,41 @@
+# Size of a single panel. Every screen is drawn at this size, whatever the size of the wall.
+PANEL_WIDTH = 64
+PANEL_HEIGHT = 32
+
+class PanelLayout:
+    """Where screens go on a wall of panels. Panels in a chain sit side by side, and parallel chains are stacked on top of each other.
+
+    Renderers only ever draw a single panel sized tile, so all of their coordinates are relative to the panel.
+    The layout places tiles onto the wall, one game per panel, so a wall of four panels shows four games at once.
+    """
+
+    def __init__(self, chainLength=1, parallel=1, panelWidth=PANEL_WIDTH, panelHeight=PANEL_HEIGHT) -> None:
+        self.chainLength = chainLength
+        self.parallel = parallel
+        self.panelWidth = panelWidth
+        self.panelHeight = panelHeight
+        self.width = panelWidth * chainLength
+        self.height = panelHeight * parallel
+
+        # Top left corner of each panel, in the order games fill them. Left to right, then top to bottom.
+        self.regions = [(col * panelWidth, row * panelHeight) for row in range(parallel) for col in range(chainLength)]
+
+    @property
+    def slots(self):
+        """Number of games that fit on the wall at once."""
+        return len(self.regions)
+
+    def getPages(self, games):
+        """Splits the games into pages, each of which fills the wall once.
+
+        Args:
+            games (list of GameRecords): Games in the order they're shown.
+
+        Returns:
+            pages (list of lists of GameRecords): At most slots games per page.
+        """
+        return [games[i:i + self.slots] for i in range(0, len(games), self.slots)]
+
+    def getCenter(self):
+        """Returns where to place a tile so it's in the middle of the wall. Used for screens that aren't about one game."""
+        return ((self.width - self.panelWidth) // 2, (self.height - self.panelHeight) // 2)
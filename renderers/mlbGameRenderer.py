@@ -1,29 +1,36 @@
 from renderers.commonRenderer import CommonRenderer
 from PIL import Image, ImageDraw, ImageFont
-from util import imageUtil
+from util.logoCache import logoCache
 import math
 
 class MlbGameRenderer(CommonRenderer):
+    # Fields of a game that affect what's drawn.
+    RENDER_FIELDS = (
+        'status', 'awayAbbrev', 'homeAbbrev', 'startTime', 'startAmPm', 'awayStartingPitcher', 'homeStartingPitcher',
+        'currentInning', 'inningState', 'balls', 'strikes', 'outs', 'onFirst', 'onSecond', 'onThird',
+        'awayScore', 'homeScore', 'awayHits', 'homeHits'
+    )
+
     def __init__(self, matrix, image, draw) -> None:
         super().__init__(matrix, image, draw)
 
-    def render(self, game):
+    def buildFrame(self, game):
 
         # If the GameId is the NO_GAME indicator, render no games
-        if game['gameId'] == 'NO_GAMES':
+        if game.gameId == 'NO_GAMES':
             self.buildNoGames()
             return
 
         # If the game is postponed, build the postponed screen.
-        if game['status'] == "Postponed":
+        if game.status == "Postponed":
             self.buildGamePostponed(game)
 
         # If the game has yet to begin, build the game not started screen.
-        elif game['status'] == "Preview":
+        elif game.status == "Preview":
             self.buildGameNotStarted(game)
 
         # If the game is over, build the final score screen.
-        elif game['status'] == "Final":
+        elif game.status == "Final":
             self.buildGameOver(game)
         
         # Otherwise, the game is in progress. Build the game in progress screen.
@@ -36,19 +43,19 @@ class MlbGameRenderer(CommonRenderer):
         """Adds all aspects of the game not started screen to the image object.
 
         Args:
-            game (dict): All information for a specific game.
+            game (GameRecord): All information for a specific game.
         """
 
         # Add the logos of the teams inivolved to the image.
-        self.displayLogos(game['league'],game['awayAbbrev'],game['homeAbbrev'])
+        self.displayLogos(game.league,game.awayAbbrev,game.homeAbbrev)
 
-        self.displayTime(game['dateTime']['time'] + " " + game['dateTime']['ampm'], (self.firstMiddleCol, 0))
+        self.displayTime(game.startTime + " " + game.startAmPm, (self.firstMiddleCol, 0))
         
-        self.draw.text((self.firstMiddleCol+1,8), game['awayStartingPitcher'], font=self.fontSmallReg, fill=self.fillWhite)
+        self.draw.text((self.firstMiddleCol+1,8), game.awayStartingPitcher, font=self.fontSmallReg, fill=self.fillWhite)
 
-        self.draw.text((self.firstMiddleCol+3,16), 'vs', font=self.fontSmallReg, fill=self.fillWhite)
+        self.drawText((self.firstMiddleCol+3,16), 'vs', self.fontSmallReg, self.fillWhite)
 
-        self.draw.text((self.firstMiddleCol+1,24), game['homeStartingPitcher'], font=self.fontSmallReg, fill=self.fillWhite)
+        self.draw.text((self.firstMiddleCol+1,24), game.homeStartingPitcher, font=self.fontSmallReg, fill=self.fillWhite)
 
 
 
@@ -56,34 +63,34 @@ class MlbGameRenderer(CommonRenderer):
         """Adds all aspects of the game in progress screen to the image object.
 
         Args:
-            game (dict): All information for a specific game.
-            gameOld (dict): The same information, but from one cycle ago.
+            game (GameRecord): All information for a specific game.
+            gameOld (GameRecord): The same information, but from one cycle ago.
             scoringTeam (string): If the home team, away team, or both, or neither scored.
         """
 
         # Add the logos of the teams inivolved to the image.
-        self.displayLogos(game['league'],game['awayAbbrev'],game['homeAbbrev'])
+        self.displayLogos(game.league,game.awayAbbrev,game.homeAbbrev)
 
-        if game['inningState'] != "Top":
+        if game.inningState != "Top":
             self.draw.polygon([(43,17), (45, 17), (44,18)],fill=self.fillWhite, outline=self.fillWhite)
-        if game['inningState'] != "Bottom":
+        if game.inningState != "Bottom":
             self.draw.polygon([(43,15), (45, 15), (44,14)],fill=self.fillWhite, outline=self.fillWhite)
 
         self.displayAtBat(game)
         self.displayBaseRunners(game)
 
-        self.draw.text((47, 12), str(game['currentInning']), font=self.fontSmallReg, fill=self.fillWhite)
+        self.drawText((47, 12), str(game.currentInning), self.fontSmallReg, self.fillWhite)
 
         # Add the current score to the image. Note if either team scored.
         self.displayScore(game)
 
     def displayAtBat(self, game):
-        balls = game['balls']
-        strikes = game['strikes']
-        outs = game['outs']
+        balls = game.balls
+        strikes = game.strikes
+        outs = game.outs
 
         # Count
-        self.draw.text((41, 22), f'{balls}-{strikes}', font=self.fontSmallReg, fill=self.fillWhite)
+        self.drawText((41, 22), f'{balls}-{strikes}', self.fontSmallReg, self.fillWhite)
 
         fillOne = self.fillWhite if outs > 0 else None
         fillTwo = self.fillWhite if outs > 1 else None
@@ -93,9 +100,9 @@ class MlbGameRenderer(CommonRenderer):
         self.draw.ellipse([(58, 10), (62, 14)], fill=fillTwo, outline=self.fillWhite)
 
     def displayBaseRunners(self, game):
-        onFirst = self.fillWhite if game['onFirst'] else None
-        onSecond = self.fillWhite if game['onSecond'] else None
-        onThird = self.fillWhite if game['onThird'] else None
+        onFirst = self.fillWhite if game.onFirst else None
+        onSecond = self.fillWhite if game.onSecond else None
+        onThird = self.fillWhite if game.onThird else None
 
         self.draw.polygon([(39, 9), (42, 6), (45, 9), (42, 12)], fill=onThird, outline=self.fillWhite)
         self.draw.polygon([(44, 4), (47, 1), (50, 4), (47, 7)], fill=onSecond, outline=self.fillWhite)
@@ -108,42 +115,42 @@ class MlbGameRenderer(CommonRenderer):
         """Adds all aspects of the game over screen to the image object.
 
         Args:
-            game (dict): All information for a specific game.
+            game (GameRecord): All information for a specific game.
             scoringTeam (string): If the home team, away team, or both, or neither scored.
         """
 
         # Add the logos of the teams involved to the image.
-        self.displayLogos(game['league'],game['awayAbbrev'],game['homeAbbrev'])
+        self.displayLogos(game.league,game.awayAbbrev,game.homeAbbrev)
 
         # Add "Final" to the image.
-        self.draw.text((40, 11), "F", font=self.fontMedReg, fill=self.fillWhite)
-        self.draw.text((44, 13), "i", font=self.fontSmallReg, fill=self.fillWhite)
-        self.draw.text((49, 13), "n", font=self.fontSmallReg, fill=self.fillWhite)
-        self.draw.text((53, 13), "a", font=self.fontSmallReg, fill=self.fillWhite)
-        self.draw.text((57, 13), "l", font=self.fontSmallReg, fill=self.fillWhite)
+        self.drawPieces((40, 11), (
+            (0, 0, "F", self.fontMedReg),
+            (4, 2, "i", self.fontSmallReg),
+            (9, 2, "n", self.fontSmallReg),
+            (13, 2, "a", self.fontSmallReg),
+            (17, 2, "l", self.fontSmallReg)
+        ), self.fillWhite)
 
         # Add the current score to the image. Note if either team scored.
         self.displayScore(game)
 
     def buildNoGames(self):
-        mlbLogo = Image.open("assets/images/MLB_Logo.png")
-        mlbLogo = imageUtil.cropImage(mlbLogo)
-        mlbLogo.thumbnail((32,32))
-        self.image.paste(mlbLogo, (16, 4))
-        self.draw.text((12, 22), f'No games', font=self.fontSmallReg, fill=self.fillWhite)
+        mlbLogo = logoCache.getLeagueLogo('mlb', (32,32))
+        self.image.paste(mlbLogo.image, (16, 4))
+        self.drawText((12, 22), 'No games', self.fontSmallReg, self.fillWhite)
 
     def buildGamePostponed(self, game):
         """Adds all aspects of the postponed screen to the image object.
 
         Args:
-            game (dict): All information for a specific game.
+            game (GameRecord): All information for a specific game.
         """
         
         # Add the logos of the teams involved to the image.
-        self.displayLogos(game['league'],game['awayAbbrev'],game['homeAbbrev'])
+        self.displayLogos(game.league,game.awayAbbrev,game.homeAbbrev)
 
         # Add "PPD" to the image.
-        self.draw.text((self.firstMiddleCol+12,10), "PPD", font=self.fontMedReg, fill=self.fillWhite)
+        self.drawText((self.firstMiddleCol+12,10), "PPD", self.fontMedReg, self.fillWhite)
 
     
 
@@ -155,26 +162,21 @@ class MlbGameRenderer(CommonRenderer):
             homeScore (int): Score of the home team.
         """
 
-        awayScore = game['awayRuns']
-        homeScore = game['homeRuns']
+        awayScore = game.awayScore
+        homeScore = game.homeScore
 
-        awayHits = game['awayHits']
-        homeHits = game['homeHits']
+        awayHits = game.awayHits
+        homeHits = game.homeHits
 
         fillHome = self.fillWhite if awayScore > homeScore or awayScore == homeScore else self.fillRed
         fillAway = self.fillWhite if awayScore < homeScore or awayScore == homeScore else self.fillRed
 
-        self.draw.text((21,-1), f'R', font=self.fontSmallReg, fill=fillAway)
-        self.draw.text((26,-1), f'{awayScore}', font=self.fontSmallReg, fill=fillAway)
-
-        self.draw.text((21,6), f'H', font=self.fontSmallReg, fill=self.fillWhite)
-        self.draw.text((26,6), f'{awayHits}', font=self.fontSmallReg, fill=self.fillWhite)
-        
-        self.draw.text((21,16), f'R', font=self.fontSmallReg, fill=fillHome)
-        self.draw.text((26,16), f'{homeScore}', font=self.fontSmallReg, fill=fillHome)
+        # Each label and its number are drawn as a single run.
+        self.drawPieces((21,-1), ((0, 0, 'R', self.fontSmallReg), (5, 0, f'{awayScore}', self.fontSmallReg)), fillAway)
+        self.drawPieces((21,6), ((0, 0, 'H', self.fontSmallReg), (5, 0, f'{awayHits}', self.fontSmallReg)), self.fillWhite)
 
-        self.draw.text((21,23), f'H', font=self.fontSmallReg, fill=self.fillWhite)
-        self.draw.text((26,23), f'{homeHits}', font=self.fontSmallReg, fill=self.fillWhite)
+        self.drawPieces((21,16), ((0, 0, 'R', self.fontSmallReg), (5, 0, f'{homeScore}', self.fontSmallReg)), fillHome)
+        self.drawPieces((21,23), ((0, 0, 'H', self.fontSmallReg), (5, 0, f'{homeHits}', self.fontSmallReg)), self.fillWhite)
 
 
         
\ No newline at end of file
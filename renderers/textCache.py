@@ -0,0 +1,91 @@
+from PIL import Image, ImageDraw
+from collections import OrderedDict
+
+# Size of the scratch image runs are rasterized on. The origin sits MARGIN pixels in, so text drawn slightly above or left of it isn't cut off.
+SCRATCH_SIZE = (128, 48)
+MARGIN = 8
+
+class GlyphRun:
+    """A run of text rasterized once, ready to be pasted. Holds the colour, the mask of the lit pixels, and where it sits relative to the point it was drawn at."""
+
+    def __init__(self, colour, mask, offset) -> None:
+        self.colour = colour
+        self.mask = mask
+        self.offsetX, self.offsetY = offset
+
+class TextCache:
+    """Keeps text that's drawn often as pre-rasterized runs, so drawing it again is a single paste rather than a draw call per piece.
+
+    A run can be a single string, or anything built from several draw calls (ex. "Final" in two fonts), as long as it only depends on its key.
+    Runs are keyed on the key and the fill. The least recently used run is dropped once maxEntries is reached.
+    """
+
+    def __init__(self, maxEntries=256) -> None:
+        self.maxEntries = maxEntries
+        self.runs = OrderedDict()
+        self.enabled = True
+        self.hits = 0
+        self.misses = 0
+        self.pastes = 0
+
+    def drawText(self, image, draw, xy, text, font, fill):
+        """Draws a single string, the same as draw.text would."""
+        self.drawRun(image, draw, xy, ('text', text, font), fill, lambda runDraw, origin, runFill: runDraw.text(origin, text, font=font, fill=runFill))
+
+    def drawRun(self, image, draw, xy, key, fill, build):
+        """Draws a run of text onto the image.
+
+        Args:
+            image (Image): Image to draw onto.
+            draw (ImageDraw): Draw object of the image. Only used if the cache is disabled.
+            xy (tuple): Point the run is drawn at.
+            key (tuple): Identifies what the run looks like. Must include everything build depends on.
+            fill (tuple): Colour of the run.
+            build (function): Draws the run. Called with a draw object, the point to draw at, and the fill.
+        """
+        if not self.enabled:
+            build(draw, xy, fill)
+            return
+
+        run = self.getRun(key, fill, build)
+        if run is None:
+            return
+
+        x, y = xy
+        image.paste(run.colour, (x + run.offsetX, y + run.offsetY), run.mask)
+        self.pastes += 1
+
+    def getRun(self, key, fill, build):
+        """Returns the rasterized run, drawing it first if needed. Returns None if the run has no lit pixels."""
+        cacheKey = (key, fill)
+        if cacheKey in self.runs:
+            self.hits += 1
+            self.runs.move_to_end(cacheKey)
+            return self.runs[cacheKey]
+
+        self.misses += 1
+
+        # Draw the run in full on a scratch mask, then keep only the part with lit pixels.
+        scratch = Image.new("L", SCRATCH_SIZE)
+        build(ImageDraw.Draw(scratch), (MARGIN, MARGIN), 255)
+        bbox = scratch.getbbox()
+
+        run = None
+        if bbox:
+            mask = scratch.crop(bbox)
+            run = GlyphRun(Image.new("RGB", mask.size, fill[:3]), mask, (bbox[0] - MARGIN, bbox[1] - MARGIN))
+
+        self.runs[cacheKey] = run
+
+        # Evict the least recently used run if over the limit.
+        if len(self.runs) > self.maxEntries:
+            self.runs.popitem(last=False)
+
+        return run
+
+    def getStats(self):
+        """Returns the number of hits, misses and pastes so far, and the number of runs held."""
+        return {'hits': self.hits, 'misses': self.misses, 'pastes': self.pastes, 'runs': len(self.runs)}
+
+# Shared by all renderers.
+textCache = TextCache()
@@ -0,0 +1,89 @@
+from PIL import Image
+from api.gameDiff import gameKey
+import math
+
+class TickerStrip:
+    """Every game side by side in one long image, for scrolling across the wall.
+
+    Each game is a segment the size of a panel, drawn by the game's renderer. When the games are refreshed, only segments of games that changed are redrawn.
+    The start of the strip is repeated at the end, so any window of the wall's width can be copied straight out of it, even as it wraps around.
+    """
+
+    def __init__(self, renderers, tile, windowWidth) -> None:
+        self.renderers = renderers
+        self.tile = tile
+        self.windowWidth = windowWidth
+        self.segmentWidth = tile.width
+
+        self.keys = []
+        self.segments = {}
+        self.image = None
+
+        # Total segments drawn by the game's renderer, across every update.
+        self.segmentsDrawn = 0
+
+    @property
+    def length(self):
+        """Width of the strip before it repeats. Scrolling this far brings it back to the start."""
+        return len(self.keys) * self.segmentWidth
+
+    def update(self, games):
+        """Brings the strip up to date with the games.
+
+        Args:
+            games (list of GameRecords): Games in the order they're shown.
+
+        Returns:
+            drawn (int): Number of segments that had to be redrawn.
+        """
+        keys = [gameKey(game) for game in games]
+        segments = {}
+        changed = []
+
+        for key, game in zip(keys, games):
+            # Records are immutable, so an unchanged game is the same record (or an equal one) as last time.
+            segment = self.segments.get(key)
+            if segment is None or segment[0] != game:
+                self.renderers[game.league].render(game)
+                segment = (game, self.tile.copy())
+                changed.append(key)
+            segments[key] = segment
+
+        # Games dropped from the strip are dropped from here too.
+        self.segments = segments
+
+        # The whole strip only needs to be laid out again if games were added, removed or moved.
+        if keys != self.keys or self.image is None:
+            self.keys = keys
+            self.layout()
+        else:
+            for key in changed:
+                self.pasteSegment(keys.index(key))
+
+        self.segmentsDrawn += len(changed)
+        return len(changed)
+
+    def layout(self):
+        """Creates a new strip image with every segment in place."""
+        slots = len(self.keys) + math.ceil(self.windowWidth / self.segmentWidth)
+        self.image = Image.new("RGB", (slots * self.segmentWidth, self.tile.height))
+
+        for i in range(len(self.keys)):
+            self.pasteSegment(i)
+
+    def pasteSegment(self, index):
+        """Pastes a segment everywhere it appears in the strip, including the repeat at the end."""
+        image = self.segments[self.keys[index]][1]
+        for x in range(index * self.segmentWidth, self.image.width, self.length):
+            self.image.paste(image, (x, 0))
+
+    def drawWindow(self, image, offset, position):
+        """Copies the part of the strip that starts offset pixels in onto the image. A single paste, nothing is redrawn.
+
+        Args:
+            image (Image): Image to copy onto.
+            offset (int): How far the strip has scrolled, from 0 up to its length.
+            position (tuple): Where the window goes on the image.
+        """
+        x, y = position
+        image.paste(self.image, (x - offset, y))
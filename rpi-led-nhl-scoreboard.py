@@ -1,184 +1,427 @@
 from PIL import Image, ImageDraw, ImageFont
-from rgbmatrix import RGBMatrix, RGBMatrixOptions
-from datetime import datetime
+import argparse
+import functools
 import time
-from util import imageUtil, timeUtil
-from api.gameData import fetchGameData, fetchMlbGame
+from util.brightnessSchedule import BrightnessSchedule, buildHourlyTable, buildSunTable, IlluminanceSensor, FakeSensor
+from util.fontRegistry import fontRegistry
+from util.logoCache import logoCache
+from util.metrics import metrics
+from util.slideScheduler import SlideScheduler
+from api.api import LeagueApiInterface
+from api.fixtures import FixtureSession, RecordingSession
+from api.poller import GamePoller
+from api.gameDiff import NEW
+from api.gameOrder import gameOrder
+from display.display import createDisplay
 from renderers.nhlGameRenderer import NhlGameRenderer
 from renderers.mlbGameRenderer import MlbGameRenderer
+from renderers.frameCache import frameCache
+from renderers.textCache import textCache
+from renderers.layout import PanelLayout
+from renderers.tickerStrip import TickerStrip
 
+# Number of seconds between checks for new events while a slide is held.
+HOLD_STEP = .25
+
+# How a score is highlighted: number of pulses, seconds per half pulse, and seconds to hold the game afterwards.
+HIGHLIGHT_PULSES = 3
+HIGHLIGHT_PULSE_TIME = .3
+HIGHLIGHT_HOLD = 8
+
+# Number of seconds each brightness step of a fade is shown for.
+FADE_STEP_TIME = .025
+
+# Frames per second the ticker is shown at, and how many pixels per second it scrolls.
+TICKER_FPS = 60
+TICKER_SPEED = 60
 
 def buildNoGamesToday():
     """Adds all aspects of the no games today screen to the image object."""
+    clearTile()
 
     # Add the NHL logo to the image.
-    nhlLogo = Image.open("assets/images/NHL_Logo_Simplified.png")
-    nhlLogo = imageUtil.cropImage(nhlLogo)
-    nhlLogo.thumbnail((25,15))
-    image.paste(nhlLogo, (1, 1))
+    nhlLogo = logoCache.getLeagueLogo('nhl', (25,15))
+    tile.paste(nhlLogo.image, (1, 1))
 
-    mlbLogo = Image.open("assets/images/MLB_Logo.png")
-    mlbLogo = imageUtil.cropImage(mlbLogo)
-    mlbLogo.thumbnail((20,30))
-    image.paste(mlbLogo, (1, 20))
+    mlbLogo = logoCache.getLeagueLogo('mlb', (20,30))
+    tile.paste(mlbLogo.image, (1, 20))
 
     # Add "No Games Today" to the image.
-    draw.text((32,0), "No", font=fontMedReg, fill=fillWhite)
-    draw.text((32,10), "Games", font=fontMedReg, fill=fillWhite)
-    draw.text((32,20), "Today", font=fontMedReg, fill=fillWhite)
+    tileDraw.text((32,0), "No", font=fontMedReg, fill=fillWhite)
+    tileDraw.text((32,10), "Games", font=fontMedReg, fill=fillWhite)
+    tileDraw.text((32,20), "Today", font=fontMedReg, fill=fillWhite)
+
+    placeTile(layout.getCenter())
 
 def buildLoading():
     """Adds all aspects of the loading screen to the image object."""
+    clearTile()
 
     # Add the NHL logo to the image.
-    nhlLogo = Image.open("assets/images/NHL_Logo_Simplified.png")
-    nhlLogo = imageUtil.cropImage(nhlLogo)
-    nhlLogo.thumbnail((40,30))
-    image.paste(nhlLogo, (1, 1))
+    nhlLogo = logoCache.getLeagueLogo('nhl', (40,30))
+    tile.paste(nhlLogo.image, (1, 1))
+
+    mlbLogo = logoCache.getLeagueLogo('mlb', (30,60))
+    tile.paste(mlbLogo.image, (30, 8))
 
-    mlbLogo = Image.open("assets/images/MLB_Logo.png")
-    mlbLogo = imageUtil.cropImage(mlbLogo)
-    mlbLogo.thumbnail((30,60))
-    image.paste(mlbLogo, (30, 8))
+    placeTile(layout.getCenter())
 
 def buildError(msg):
+    """Adds all aspects of the error screen to the image object.
+
+    Args:
+        msg (string): Short description of what went wrong. Each word goes on its own line, so keep it to a couple of short words.
     """
-        Error screen
-    """
-    draw.text((32,0), "Error", font=fontMedReg, fill=fillWhite)
-    draw.text((32,10), msg, font=fontMedReg, fill=fillWhite)
+    clearTile()
+    tileDraw.text((32,0), "Error", font=fontMedReg, fill=fillWhite)
+    for i, word in enumerate(msg.split()[:2]):
+        tileDraw.text((32,10 + 10*i), word, font=fontMedReg, fill=fillWhite)
+
+    placeTile(layout.getCenter())
+
+def buildPage(page, renderers):
+    """Adds a page of games to the image object, one game per panel."""
+    clearImage()
+
+    for region, game in zip(layout.regions, page):
+        renderers[game.league].render(game)
+        placeTile(region)
+
+def clearImage():
+    """Makes the image totally blank, and lets the display know it's changed."""
+    draw.rectangle(((0,0),(layout.width-1,layout.height-1)), fill=fillBlack)
+    display.invalidate()
+
+def clearTile():
+    """Makes the single panel tile that screens are drawn on totally blank."""
+    tileDraw.rectangle(((0,0),(layout.panelWidth-1,layout.panelHeight-1)), fill=fillBlack)
+
+def placeTile(position):
+    """Copies the tile onto the image at the given position, and lets the display know it's changed."""
+    image.paste(tile, position)
+    display.invalidate()
+
+def stepBrightness(levels):
+    """Shows the image at each brightness level in turn. Steps are timed against a monotonic clock, so time spent drawing isn't added on top."""
+    start = time.monotonic()
+    for i, brightness in enumerate(levels):
+        display.show(image, brightness)
+        display.sleep(max(0, start + (i + 1) * FADE_STEP_TIME - time.monotonic()))
 
 def fadeOut(maxBrightness, fadeStep):
-     # Fade down to black.
-    for brightness in range(maxBrightness,0,-fadeStep):
-        matrix.brightness = brightness
-        matrix.SetImage(image)
-        time.sleep(.025)
+    # Other transitions go straight from one screen to the next. Keep what's shown for the next one to start from.
+    if transitions:
+        transitions.hold(image)
+        clearImage()
+        return
+
+    with metrics.timer('fade'):
+        # Fade down to black. Uses the same brightness levels as fading in, so the display can reuse what it drew then.
+        stepBrightness(reversed(range(fadeStep,maxBrightness,fadeStep)))
 
-    # Make the screen totally blank between fades.
-    draw.rectangle(((0,0),(63,31)), fill=fillBlack) 
-    matrix.SetImage(image)
+        # Make the screen totally blank between fades.
+        clearImage()
+        display.showBlank()
 
 def fadeIn(maxBrightness, fadeStep):
-    # Fade up to the image.
-    for brightness in range(0,maxBrightness,fadeStep):
-        matrix.brightness = brightness
-        matrix.SetImage(image)
-        time.sleep(.025)
+    if transitions:
+        with metrics.timer('fade'):
+            transitions.play(image, lambda frame: display.showFrame(frame, maxBrightness), display.sleep, lambda: metrics.timer('transition'))
+        return
+
+    with metrics.timer('fade'):
+        # Fade up to the image.
+        stepBrightness(range(0,maxBrightness,fadeStep))
+
+
+def checkEvents(poller, scheduler):
+    """Takes the latest change events from the poller. Old frames of changed games are dropped, and scores are queued to interrupt the rotation."""
+    events = poller.takeEvents()
+
+    # Only games that changed since they were last drawn need new frames. Their old frames won't come up again.
+    for event in events:
+        if event.kind != NEW:
+            frameCache.discardGame(*event.key)
+
+    if scheduler:
+        scheduler.addEvents(events)
+
+def holdSlide(seconds, poller, scheduler):
+    """Holds the current slide for the given number of seconds, checking for new events as it goes.
+
+    Returns:
+        finished (bool): False if the slide was cut short because an event is waiting to be shown.
+    """
+    held = 0
+    while held < seconds:
+        checkEvents(poller, scheduler)
+        if scheduler.hasPending():
+            return False
+
+        step = min(HOLD_STEP, seconds - held)
+        display.sleep(step)
+        held += step
+
+    return True
+
+def showHighlight(event, renderers, maxBrightness, fadeStep, poller, scheduler):
+    """Shows a game right away after a score, outlining the team that scored and pulsing the screen."""
+    # The event only needs to say which game. Show the newest version of it.
+    game = poller.getSnapshot().getGame(event.game) or event.game
+
+    clearImage()
+    renderers[game.league].renderHighlight(game, event.getScoringTeams())
+    placeTile(layout.getCenter())
+
+    # Pulse between two brightness levels. The image doesn't change, so the display only has to draw it once per level.
+    for i in range(HIGHLIGHT_PULSES):
+        display.show(image, maxBrightness)
+        display.sleep(HIGHLIGHT_PULSE_TIME)
+        display.show(image, max(fadeStep, maxBrightness // 3))
+        display.sleep(HIGHLIGHT_PULSE_TIME)
+
+    display.show(image, maxBrightness)
+    holdSlide(HIGHLIGHT_HOLD, poller, scheduler)
+    fadeOut(maxBrightness, fadeStep)
+
+def scrollTicker(strip, maxBrightness):
+    """Scrolls the ticker strip across the wall once. Each frame is a single copy out of the strip.
+
+    Frames are timed against a monotonic clock. If a frame runs late, the ticker skips ahead rather than slowing down.
+    """
+    frameTime = 1 / TICKER_FPS
+    position = (0, (layout.height - layout.panelHeight) // 2)
+    start = time.monotonic()
+    frame = 0
+    lastOffset = None
+
+    while True:
+        offset = int(frame * TICKER_SPEED / TICKER_FPS)
+        if offset >= strip.length:
+            break
+
+        # Only show a frame if the strip has actually moved.
+        if offset != lastOffset:
+            with metrics.timer('ticker'):
+                strip.drawWindow(image, offset, position)
+                display.showFrame(image, maxBrightness)
+            lastOffset = offset
+
+        # Wait for the next frame to be due.
+        frame += 1
+        delay = start + frame * frameTime - time.monotonic()
+        if delay > 0:
+            display.sleep(delay)
+        else:
+            frame = max(frame, int((time.monotonic() - start) / frameTime))
 
+def runScoreboard(maxCycles=None, mode='slides'):
+    """Runs the scoreboard geting scores and other game data and cycles through them in an infinite loop.
 
-def runScoreboard():
-    """Runs the scoreboard geting scores and other game data and cycles through them in an infinite loop."""
+    Args:
+        maxCycles (int): Stop after this many cycles through the games. Runs forever if None.
+        mode (string): 'slides' to show a page of games at a time, or 'ticker' to scroll every game across the wall.
+    """
 
-    # Initial calculation and setting of the max brightness.
-    maxBrightness, fadeStep = timeUtil.getMaxBrightness(int(datetime.now().strftime("%H")))
-    matrix.brightness = maxBrightness
+    # Initial lookup of the max brightness. It's looked up again before every screen, so it follows the time of day.
+    maxBrightness, fadeStep = brightness.get()
 
     # Build the loading screen.
     buildLoading()
-    matrix.SetImage(image) # Set the matrix to the image.
+    display.show(image, maxBrightness) # Set the matrix to the image.
 
-    try:
-        games = fetchGameData()
-    except Exception as e:
-        fadeOut(maxBrightness, fadeStep)
-        buildError(e)
-        fadeIn(maxBrightness, fadeStep)
+    # Start fetching game data in the background. The loading screen stays up until the first fetch is done.
+    poller = GamePoller()
+    poller.start()
+    poller.waitForSnapshot()
 
-    time.sleep(1)
+    display.sleep(1)
 
 
     fadeOut(maxBrightness, fadeStep)
 
-    nhlRenderer = NhlGameRenderer(matrix, image, draw)
-    mlbRenderer = MlbGameRenderer(matrix, image, draw)
+    # Renderers draw a single panel at a time, the layout places each panel on the wall.
+    renderers = {
+        'nhl': NhlGameRenderer(display, tile, tileDraw),
+        'mlb': MlbGameRenderer(display, tile, tileDraw)
+    }
 
-    while True:
+    # Decides when a score should interrupt the rotation. Works only off data the poller has already fetched.
+    # The ticker shows every game all the time, so it doesn't interrupt for anything.
+    scheduler = SlideScheduler() if mode == 'slides' else None
+
+    # Every game in one long strip, only used by the ticker.
+    strip = TickerStrip(renderers, tile, layout.width)
+
+    # These only exist once the scoreboard is running, so they're exposed here rather than with the rest.
+    metrics.addCounter('change_events', lambda: poller.eventsPublished)
+    metrics.addCounter('ticker_segments_drawn', lambda: strip.segmentsDrawn)
+
+    cycles = 0
+    while maxCycles is None or cycles < maxCycles:
+        cycles += 1
+        maxBrightness, fadeStep = brightness.get()
 
-        # Adjusting cycle time for single game situation.
-        if len(games) == 1:
+        # Always work from the latest game data. The poller refreshes it in the background, so this never waits on the network.
+        snapshot = poller.getSnapshot()
+        games = snapshot.games
+
+        # If there's no games to show because fetching failed, show the error until the poller has something.
+        # The poller keeps retrying in the background, so this only waits for it rather than giving up. The details were already printed by the poller.
+        if snapshot.error and not games:
+            buildError("No data")
+            fadeIn(maxBrightness, fadeStep)
+            display.sleep(10)
+            fadeOut(maxBrightness, fadeStep)
+            continue
+
+        # Split the games into pages that each fill the wall once.
+        pages = layout.getPages(list(games))
+
+        # Adjusting cycle time for single page situation.
+        if len(pages) == 1:
             cycleTime = 10
         else:
             cycleTime = 4
 
+        # If there's games today, scroll them all by at once. Only games that changed since the last time around are redrawn.
+        if games and mode == 'ticker':
+            checkEvents(poller, None)
+            strip.update(list(games))
+            scrollTicker(strip, maxBrightness)
+
         # If there's games today.
-        if games:
+        elif games:
 
-            if games[0]['league'] == 'mlb':
-                details = fetchMlbGame(games[0]['gameId'])
+            for page in pages:
+                maxBrightness, fadeStep = brightness.get()
+
+                # Show any scores that came in before moving on with the rotation.
+                checkEvents(poller, scheduler)
+                while scheduler.hasPending():
+                    event = scheduler.nextEvent()
+                    try:
+                        showHighlight(event, renderers, maxBrightness, fadeStep, poller, scheduler)
+                    except Exception as e:
+                        print('Failed to render')
+                        print(e)
+                        print(event.game)
+
+                # Use the newest version of each game if it's been refreshed since this cycle started.
+                page = [poller.getSnapshot().getGame(game) or game for game in page]
 
-            for i, game in enumerate(games):
                 try:
-                    if game['league'] == "nhl":
-                        nhlRenderer.render(game)
-                    if game['league'] == "mlb":
-                        mlbRenderer.render(details)
+                    buildPage(page, renderers)
 
                     fadeIn(maxBrightness, fadeStep)
 
-                    if len(games) > i+1:
-                        if games[i+1]['league'] == 'mlb':
-                            details = fetchMlbGame(games[i+1]['gameId'])
-                    else:
-                        if games[0]['league'] == 'mlb':
-                            details = fetchMlbGame(games[0]['gameId'])
-
-                    # Hold the screen before fading.
-                    time.sleep(cycleTime)
+                    # Hold the screen before fading. Cut short if a score comes in, it's shown before the next game.
+                    holdSlide(cycleTime, poller, scheduler)
 
                     fadeOut(maxBrightness, fadeStep)
                 except Exception as e:
                     print('Failed to render')
                     print(e)
-                    print(game)
+                    print(page)
 
-        # If there's no games, build the no games today sceen, then wait 10 minutes before checking again.
+        # If there's no games, build the no games today sceen, then wait a minute before checking the latest data again.
         else:
             buildNoGamesToday()
-            matrix.brightness = maxBrightness
-            matrix.SetImage(image)
-            time.sleep(600)
-            draw.rectangle(((0,0),(63,31)), fill=fillBlack)
-        
-        # Refresh the game data.
-        # Record the data of the last cycle in gamesOld to check for goals.
-        try:
-            games = fetchGameData()
-        except Exception as e:
-            fadeOut(maxBrightness, fadeStep)
-            buildError(e)
-            fadeIn(maxBrightness, fadeStep)
+            display.show(image, maxBrightness)
+            display.sleep(60)
+            clearImage()
 
 if __name__ == "__main__":
 
-    # This creates the options, matrix, and image objects, as well as some globals that will be needed throughout the code.
+    # This creates the display, image objects, as well as some globals that will be needed throughout the code.
     # Note a huge fan of the ammount of globals, but they work fine in a small scope project like this.
 
-    # Configure options for the matrix
-    options = RGBMatrixOptions()
-    options.rows = 32
-    options.cols = 64
-    options.chain_length = 1
-    options.parallel = 1
-    options.gpio_slowdown= 2
-    options.hardware_mapping = 'adafruit-hat'
-
-    # Define a matrix object from the options.
-    matrix = RGBMatrix(options = options)
-
-    # Define an image object that will be printed to the matrix.
-    image = Image.new("RGB", (64, 32))
+    parser = argparse.ArgumentParser(description="Display live NHL and MLB scores on an LED matrix.")
+    parser.add_argument('--display', choices=['matrix', 'memory', 'png', 'gif'], default='matrix', help="Where to show the scoreboard. Anything but matrix runs without a Pi attached.")
+    parser.add_argument('--output', default="output", help="Directory the png and gif displays write to.")
+    parser.add_argument('--fixtures', help="Replay API responses recorded in this directory instead of calling the APIs.")
+    parser.add_argument('--record', help="Record API responses to this directory, for replaying with --fixtures.")
+    parser.add_argument('--cycles', type=int, help="Stop after this many cycles through the games.")
+    parser.add_argument('--metrics-port', type=int, help="Serve Prometheus metrics on this local port, at /metrics.")
+    parser.add_argument('--metrics-log', help="Write a summary of the metrics to this rotating log file every minute.")
+    parser.add_argument('--favourites', nargs='+', default=[], metavar='TEAM', help="Abbreviations of teams to show first, ex. TOR or mlb:TOR.")
+    parser.add_argument('--mode', choices=['slides', 'ticker'], default='slides', help="Show a page of games at a time, or scroll every game across in a ticker.")
+    parser.add_argument('--transition', choices=['fade', 'crossfade', 'wipe', 'slide'], default='fade', help="How to go from one screen to the next. Anything but fade needs NumPy.")
+    parser.add_argument('--latitude', type=float, help="Latitude of the scoreboard. With --longitude, brightness follows sunrise and sunset rather than the hour.")
+    parser.add_argument('--longitude', type=float, help="Longitude of the scoreboard, in degrees east.")
+    parser.add_argument('--light-sensor', metavar='PATH', help="File a light sensor reading is read from, ex. /sys/bus/iio/devices/iio:device0/in_illuminance_raw. Scales brightness by how bright the room is.")
+    parser.add_argument('--light-full-scale', type=float, default=1000, help="Light sensor reading that counts as fully bright.")
+    parser.add_argument('--light-levels', type=float, nargs='+', metavar='LEVEL', help="Pretend light sensor readings from 0 to 1, used in turn. For trying out brightness without a sensor.")
+    parser.add_argument('--chain', type=int, default=1, help="Number of panels chained side by side.")
+    parser.add_argument('--parallel', type=int, default=1, help="Number of chains stacked on top of each other.")
+    args = parser.parse_args()
+
+    # Games are shown in the same order every cycle, with favourite teams first.
+    gameOrder.favourites = args.favourites
+
+    # Expose the caches and connection pool alongside the phase timings.
+    # Totals only ever go up, so they're counters. Sizes can go either way, so they're gauges.
+    metrics.addCounter('http_requests', lambda: LeagueApiInterface.getConnectionStats()['requests'])
+    metrics.addCounter('http_connections', lambda: LeagueApiInterface.getConnectionStats()['connections'])
+    metrics.addCounter('json_parses', lambda: LeagueApiInterface.jsonParses)
+    metrics.addCounter('not_modified', lambda: LeagueApiInterface.notModified)
+    metrics.addCounter('frame_cache_hits', lambda: frameCache.hits)
+    metrics.addCounter('frame_cache_misses', lambda: frameCache.misses)
+    metrics.addCounter('text_cache_hits', lambda: textCache.hits)
+    metrics.addCounter('text_cache_misses', lambda: textCache.misses)
+    metrics.addGauge('frame_cache_frames', lambda: len(frameCache.frames))
+
+    if args.metrics_port:
+        metrics.startServer(args.metrics_port)
+    if args.metrics_log:
+        metrics.startLog(args.metrics_log)
+
+    if args.fixtures:
+        LeagueApiInterface.useSession(FixtureSession(args.fixtures))
+    elif args.record:
+        LeagueApiInterface.useSession(RecordingSession(LeagueApiInterface.getSession(), args.record))
+
+    # Define how bright the display is through the day. Sunrise and sunset are calculated locally, nothing is fetched.
+    buildTable = buildHourlyTable
+    if args.latitude is not None and args.longitude is not None:
+        buildTable = functools.partial(buildSunTable, latitude=args.latitude, longitude=args.longitude)
+
+    sensor = None
+    if args.light_sensor:
+        sensor = IlluminanceSensor(args.light_sensor, args.light_full_scale)
+    elif args.light_levels:
+        sensor = FakeSensor(args.light_levels)
+
+    brightness = BrightnessSchedule(buildTable, sensor)
+
+    # Define the wall of panels, and where each game goes on it. A single panel shows one game at a time.
+    layout = PanelLayout(args.chain, args.parallel)
+
+    # Define the display that the image will be shown on.
+    display = createDisplay(args.display, layout.width, layout.height, args.output, args.chain, args.parallel)
+
+    # Define an image object that will be printed to the matrix. Covers the whole wall.
+    image = Image.new("RGB", (layout.width, layout.height))
 
     # Define a draw object. This will be used to draw shapes and text to the image.
     draw = ImageDraw.Draw(image)
 
-    # Declare fonts that are used throughout.
-    fontSmallReg = ImageFont.load("assets/fonts/PIL/Tamzen5x9r.pil")
-    fontSmallBold = ImageFont.load("assets/fonts/PIL/Tamzen5x9b.pil")
-    fontMedReg = ImageFont.load("assets/fonts/PIL/Tamzen6x12r.pil")
-    fontMedBold = ImageFont.load("assets/fonts/PIL/Tamzen6x12b.pil")
-    fontLargeReg = ImageFont.load("assets/fonts/PIL/Tamzen8x15r.pil")
-    fontLargeBold = ImageFont.load("assets/fonts/PIL/Tamzen8x15b.pil")
+    # Define how to go from one screen to the next. Fades are left to the display's brightness, everything else is drawn.
+    # Imported here so NumPy is only needed when it's used.
+    transitions = None
+    if args.transition != 'fade':
+        from util.transitions import TransitionEngine
+        transitions = TransitionEngine(args.transition)
+
+    # Define the single panel tile that each screen is drawn on before being placed on the wall.
+    tile = Image.new("RGB", (layout.panelWidth, layout.panelHeight))
+    tileDraw = ImageDraw.Draw(tile)
+
+    # Keep processed logos on disk so they don't need to be decoded again after a restart.
+    logoCache.cacheDir = "cache/logos"
+
+    # Declare fonts that are used throughout. Shared with the renderers via the font registry.
+    fontMedReg = fontRegistry.getFont("Tamzen6x12r")
 
     # Declare text colours that are needed.
     fillWhite = 255,255,255,255
@@ -193,4 +436,15 @@ if __name__ == "__main__":
     cycleTime = 33.5
 
     # Run the scoreboard.
-    runScoreboard()
+    start = time.perf_counter()
+    try:
+        runScoreboard(args.cycles, args.mode)
+    finally:
+        display.close()
+
+    if args.display != 'matrix':
+        frameStats = frameCache.getStats()
+        httpStats = LeagueApiInterface.getConnectionStats()
+        print(f"Frames: {frameStats['hits']} reused, {frameStats['misses']} drawn")
+        print(f"HTTP: {httpStats['requests']} requests, {httpStats['connections']} connections, {httpStats['reused']} reused")
+        print(f'Ran {args.cycles} cycles in {time.perf_counter() - start:.2f}s')
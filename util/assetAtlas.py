@@ -0,0 +1,131 @@
+from PIL import Image, ImageFont
+import io
+import json
+import mmap
+import os
+import struct
+
+# Default location of the atlas built by assets/atlasConv.py.
+ATLAS_PATH = "assets/atlas.bin"
+
+# Every atlas starts with this, followed by the length of the index and the index itself.
+ATLAS_MAGIC = b'SBATLAS1'
+ATLAS_HEADER = '<8sI'
+
+def logoKey(league, abbreviation, size):
+    """Returns the key used to index a logo in the atlas. League logos have no abbreviation."""
+    width, height = size
+    return f'{league}/{abbreviation or ""}/{width}x{height}'
+
+class AssetAtlas:
+    """Read-only view of a packed atlas of logos and font glyphs. The whole file is memory mapped, nothing is decoded up front.
+
+    The atlas is laid out as:
+        header: magic and the length of the index.
+        index: JSON, mapping logo keys and font names to offsets into the data.
+        data: raw RGB logo tiles, and the metrics and L mode glyph bitmaps of each font. Offsets are relative to the start of the data.
+    """
+
+    def __init__(self, path) -> None:
+        with open(path, 'rb') as fp:
+            self.mapping = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        self.data = memoryview(self.mapping)
+
+        magic, indexLength = struct.unpack_from(ATLAS_HEADER, self.data)
+        if magic != ATLAS_MAGIC:
+            raise ValueError(f'{path} is not an asset atlas')
+
+        indexStart = struct.calcsize(ATLAS_HEADER)
+        self.index = json.loads(bytes(self.data[indexStart:indexStart + indexLength]).decode('utf-8'))
+        self.dataStart = indexStart + indexLength
+
+    def getLogo(self, league, abbreviation, size):
+        """Returns the cropped and resized logo as an RGB image, or None if it isn't in the atlas."""
+        entry = self.index['logos'].get(logoKey(league, abbreviation, size))
+        if entry is None:
+            return None
+
+        return Image.frombuffer("RGB", (entry['width'], entry['height']), self._slice(entry), "raw", "RGB", 0, 1)
+
+    def getFont(self, name):
+        """Returns the font with the given name (ex. 'Tamzen5x9r'), or None if it isn't in the atlas."""
+        entry = self.index['fonts'].get(name)
+        if entry is None:
+            return None
+
+        bitmap = entry['bitmap']
+        image = Image.frombuffer("L", (bitmap['width'], bitmap['height']), self._slice(bitmap), "raw", "L", 0, 1)
+
+        font = ImageFont.ImageFont()
+        font._load_pilfont_data(io.BytesIO(self._slice(entry['metrics'])), image)
+        return font
+
+    def _slice(self, entry):
+        start = self.dataStart + entry['offset']
+        return self.data[start:start + entry['length']]
+
+def writeAtlas(path, logos, fonts):
+    """Packs logos and fonts into a single atlas file.
+
+    Args:
+        path (string): Where to write the atlas.
+        logos (dict): Maps logo keys to processed RGB images.
+        fonts (dict): Maps font names to a tuple of the .pil metrics (bytes) and the glyph bitmap (image).
+    """
+    index = {'logos': {}, 'fonts': {}}
+    blobs = []
+    offset = 0
+
+    def addBlob(data):
+        nonlocal offset
+        entry = {'offset': offset, 'length': len(data)}
+        blobs.append(data)
+        offset += len(data)
+        return entry
+
+    for key, image in logos.items():
+        entry = addBlob(image.convert("RGB").tobytes())
+        entry['width'], entry['height'] = image.size
+        index['logos'][key] = entry
+
+    for name, (metrics, bitmap) in fonts.items():
+        bitmapEntry = addBlob(bitmap.convert("L").tobytes())
+        bitmapEntry['width'], bitmapEntry['height'] = bitmap.size
+        index['fonts'][name] = {'metrics': addBlob(metrics), 'bitmap': bitmapEntry}
+
+    encoded = json.dumps(index, separators=(',', ':')).encode('utf-8')
+
+    with open(path + '.tmp', 'wb') as fp:
+        fp.write(struct.pack(ATLAS_HEADER, ATLAS_MAGIC, len(encoded)))
+        fp.write(encoded)
+        for blob in blobs:
+            fp.write(blob)
+
+    # Swap the new atlas in all at once, so a running scoreboard never sees a partial file.
+    os.replace(path + '.tmp', path)
+
+_atlas = None
+_atlasLoaded = False
+
+def getAtlas():
+    """Returns the shared atlas, mapping it on first use. Returns None if no atlas has been built."""
+    global _atlas, _atlasLoaded
+
+    if not _atlasLoaded:
+        _atlasLoaded = True
+        try:
+            _atlas = AssetAtlas(ATLAS_PATH)
+        except (OSError, ValueError) as e:
+            print('Asset atlas not loaded, falling back to individual files')
+            print(e)
+            _atlas = None
+
+    return _atlas
+
+def loadFont(name):
+    """Loads a font by name (ex. 'Tamzen5x9r'). Uses the atlas if there is one, otherwise the .pil file."""
+    atlas = getAtlas()
+    font = atlas.getFont(name) if atlas else None
+    if font is None:
+        font = ImageFont.load("assets/fonts/PIL/" + name + ".pil")
+    return font
@@ -0,0 +1,142 @@
+from datetime import datetime
+from util import timeUtil
+import itertools
+import math
+
+MINUTES_PER_DAY = 24 * 60
+
+# Brightness is never set lower than this, so the display doesn't fully turn off.
+MIN_BRIGHTNESS = 15
+MAX_BRIGHTNESS = 100
+
+# Number of minutes it takes to brighten around sunrise and dim around sunset.
+TWILIGHT_MINUTES = 60
+
+def getFadeStep(maxBrightness):
+    """Fade step divides the max brightness into 15 segments, the same as timeUtil.getMaxBrightness."""
+    return math.ceil(maxBrightness / 15)
+
+def buildHourlyTable(day):
+    """Builds a table from the hour of the day alone, brightest at noon. The same as the scoreboard has always used."""
+    return [timeUtil.getMaxBrightness(minute // 60) for minute in range(MINUTES_PER_DAY)]
+
+def getSunTimes(day, latitude, longitude):
+    """Calculates sunrise and sunset with the NOAA approximation. Accurate to within a few minutes, which is plenty for brightness.
+
+    Args:
+        day (date): Day to calculate for.
+        latitude (float): Degrees north.
+        longitude (float): Degrees east.
+
+    Returns:
+        sunrise (float): Minutes after local midnight. May be outside 0-1440 near the poles.
+        sunset (float): Minutes after local midnight.
+    """
+    year = 2 * math.pi / 365 * (day.timetuple().tm_yday - 1)
+
+    # Equation of time (minutes) and solar declination (radians).
+    eqTime = 229.18 * (0.000075 + 0.001868 * math.cos(year) - 0.032077 * math.sin(year) - 0.014615 * math.cos(2 * year) - 0.040849 * math.sin(2 * year))
+    declination = (0.006918 - 0.399912 * math.cos(year) + 0.070257 * math.sin(year) - 0.006758 * math.cos(2 * year)
+        + 0.000907 * math.sin(2 * year) - 0.002697 * math.cos(3 * year) + 0.00148 * math.sin(3 * year))
+
+    # Hour angle of the sun when it crosses the horizon. Clamped for days when it never rises or never sets.
+    lat = math.radians(latitude)
+    cosHourAngle = math.cos(math.radians(90.833)) / (math.cos(lat) * math.cos(declination)) - math.tan(lat) * math.tan(declination)
+    hourAngle = math.degrees(math.acos(max(-1, min(1, cosHourAngle))))
+
+    # Convert from UTC to the local timezone set on the RPi.
+    offset = datetime(day.year, day.month, day.day, 12).astimezone().utcoffset().total_seconds() / 60
+
+    sunrise = 720 - 4 * (longitude + hourAngle) - eqTime + offset
+    sunset = 720 - 4 * (longitude - hourAngle) - eqTime + offset
+    return sunrise, sunset
+
+def buildSunTable(day, latitude, longitude):
+    """Builds a table that's at full brightness between sunrise and sunset, at the minimum overnight, and ramps between them at twilight."""
+    sunrise, sunset = getSunTimes(day, latitude, longitude)
+
+    def getDaylight(minute):
+        # How far into the day it is, from 0 (night) to 1 (day). Centered on sunrise and sunset.
+        return min(
+            max(0, min(1, (minute - sunrise) / TWILIGHT_MINUTES + .5)),
+            max(0, min(1, (sunset - minute) / TWILIGHT_MINUTES + .5))
+        )
+
+    table = []
+    for minute in range(MINUTES_PER_DAY):
+        # Depending on the timezone, daylight can run past midnight at either end, so check the days either side too.
+        daylight = max(getDaylight(minute - MINUTES_PER_DAY), getDaylight(minute), getDaylight(minute + MINUTES_PER_DAY))
+        maxBrightness = round(MIN_BRIGHTNESS + (MAX_BRIGHTNESS - MIN_BRIGHTNESS) * daylight)
+        table.append((maxBrightness, getFadeStep(maxBrightness)))
+
+    return table
+
+class AmbientSensor:
+    """Reads how bright the room is. Implemented for each kind of sensor."""
+
+    def read(self):
+        """Returns the light level from 0 (dark) to 1 (bright), or None if it couldn't be read."""
+        return None
+
+class IlluminanceSensor(AmbientSensor):
+    """Reads a light sensor exposed by the kernel as a file holding a single number, ex. /sys/bus/iio/devices/iio:device0/in_illuminance_raw.
+    Readings at or above fullScale count as fully bright.
+    """
+
+    def __init__(self, path, fullScale=1000) -> None:
+        self.path = path
+        self.fullScale = fullScale
+
+    def read(self):
+        try:
+            with open(self.path) as fp:
+                value = float(fp.read().strip())
+        except (OSError, ValueError) as e:
+            print('Unable to read light sensor')
+            print(e)
+            return None
+        return max(0, min(1, value / self.fullScale))
+
+class FakeSensor(AmbientSensor):
+    """Returns the given light levels in turn, repeating once it runs out. For trying out a schedule without a sensor."""
+
+    def __init__(self, levels) -> None:
+        self.levels = itertools.cycle(levels)
+
+    def read(self):
+        return next(self.levels)
+
+class BrightnessSchedule:
+    """A table of the max brightness and fade step for every minute of the day, built once a day and looked up as the scoreboard runs.
+
+    If there's a sensor, the brightness from the table is scaled by how bright the room is.
+    """
+
+    def __init__(self, buildTable=buildHourlyTable, sensor=None) -> None:
+        self.buildTable = buildTable
+        self.sensor = sensor
+        self.day = None
+        self.table = None
+
+    def get(self, now=None):
+        """Returns the max brightness and fade step for the given time, or for right now.
+
+        Returns:
+            maxBrightness (int): The maximum brightness for the LED display.
+            fadeStep (int): The increments that the display should fade up and down by.
+        """
+        now = now or datetime.now()
+
+        # Sunrise and sunset move every day, so the table is rebuilt when the day changes.
+        if now.date() != self.day:
+            self.day = now.date()
+            self.table = self.buildTable(self.day)
+
+        maxBrightness, fadeStep = self.table[now.hour * 60 + now.minute]
+
+        level = self.sensor.read() if self.sensor else None
+        if level is not None:
+            maxBrightness = max(MIN_BRIGHTNESS, min(MAX_BRIGHTNESS, math.ceil(maxBrightness * level)))
+            fadeStep = getFadeStep(maxBrightness)
+
+        return maxBrightness, fadeStep
@@ -0,0 +1,37 @@
+from util import assetAtlas
+import threading
+
+class FontRegistry:
+    """Process wide registry of fonts. Each font is loaded the first time it's asked for, and that one instance is shared by everyone after."""
+
+    def __init__(self) -> None:
+        self.fonts = {}
+        self.lock = threading.Lock()
+
+    def getFont(self, name):
+        """Returns the font with the given name (ex. 'Tamzen5x9r'), loading it if this is the first time it's been used."""
+        font = self.fonts.get(name)
+        if font is None:
+            with self.lock:
+                # Another thread may have loaded it while we waited on the lock.
+                font = self.fonts.get(name)
+                if font is None:
+                    font = assetAtlas.loadFont(name)
+                    self.fonts[name] = font
+        return font
+
+    def loaded(self):
+        """Returns the names of all fonts that have been loaded so far."""
+        return list(self.fonts)
+
+class FontAttribute:
+    """Class attribute that looks a font up from the shared registry when accessed. Nothing is loaded until a renderer actually draws with it."""
+
+    def __init__(self, name) -> None:
+        self.name = name
+
+    def __get__(self, obj, objtype=None):
+        return fontRegistry.getFont(self.name)
+
+# Shared by the whole process.
+fontRegistry = FontRegistry()
@@ -0,0 +1,132 @@
+from PIL import Image
+from collections import OrderedDict
+from util import imageUtil, assetAtlas
+import math
+import os
+import struct
+
+# League logos that aren't tied to a specific team.
+LEAGUE_LOGOS = {
+    'nhl': "assets/images/NHL_Logo_Simplified.png",
+    'mlb': "assets/images/MLB_Logo.png"
+}
+
+def teamLogoPath(league, abbreviation):
+    """Returns the path of a team's source PNG."""
+    return "assets/images/team logos/" + league + "/png/" + abbreviation + ".png"
+
+class Logo:
+    """A logo that has been cropped and resized, ready to be pasted onto the image object."""
+
+    def __init__(self, image) -> None:
+        self.image = image
+        self.width, self.height = image.size
+
+        # Precompute the offsets needed to center the logo on a point.
+        self.offsetX = math.floor(self.width / 2)
+        self.offsetTop = math.ceil(self.height / 2)
+        self.offsetBottom = math.floor(self.height / 2)
+
+class LogoCache:
+    """Keeps processed logos in memory so each PNG only needs to be decoded, cropped, and resized once.
+
+    Logos are keyed by (league, abbreviation, size). The least recently used logo is dropped once maxEntries is reached.
+    If cacheDir is set, processed logos are also written to disk as raw RGB so a cold start doesn't need to decode any PNGs.
+    """
+
+    def __init__(self, maxEntries=128, cacheDir=None) -> None:
+        self.maxEntries = maxEntries
+        self.cacheDir = cacheDir
+        self.logos = OrderedDict()
+
+    def getLogo(self, league, abbreviation, size):
+        """Returns the logo of a team, cropped and resized to fit in size.
+
+        Args:
+            league (string): League of the team. Ex. 'nhl'.
+            abbreviation (string): Abbreviation of the team.
+            size (tuple): The max width and height that the logo can be.
+
+        Returns:
+            logo (Logo): The processed logo.
+        """
+        return self._get((league, abbreviation, size), teamLogoPath(league, abbreviation))
+
+    def getLeagueLogo(self, league, size):
+        """Returns the logo of a league, cropped and resized to fit in size."""
+        return self._get((league, None, size), LEAGUE_LOGOS[league])
+
+    def processLogo(self, league, abbreviation, size):
+        """Crops and resizes a logo straight from its PNG, bypassing all caches. Used when building the asset atlas."""
+        path = LEAGUE_LOGOS[league] if abbreviation is None else teamLogoPath(league, abbreviation)
+        return self._process(path, size)
+
+    def clear(self):
+        """Drops all logos held in memory. Logos on disk are left alone."""
+        self.logos.clear()
+
+    def _get(self, key, path):
+        # Memory hit. Mark the logo as most recently used.
+        if key in self.logos:
+            self.logos.move_to_end(key)
+            return self.logos[key]
+
+        # Prefer the prebuilt atlas, then the disk cache, and only decode the PNG as a last resort.
+        atlas = assetAtlas.getAtlas()
+        image = atlas.getLogo(*key) if atlas else None
+        if image is None:
+            image = self._readTile(key)
+        if image is None:
+            image = self._process(path, key[2])
+            self._writeTile(key, image)
+
+        logo = Logo(image)
+        self.logos[key] = logo
+
+        # Evict the least recently used logo if over the limit.
+        if len(self.logos) > self.maxEntries:
+            self.logos.popitem(last=False)
+
+        return logo
+
+    def _process(self, path, size):
+        image = Image.open(path)
+        image = imageUtil.cropImage(image)
+        image.thumbnail(size)
+        return image
+
+    def _tilePath(self, key):
+        league, abbreviation, (width, height) = key
+        return os.path.join(self.cacheDir, f'{league}_{abbreviation or "league"}_{width}x{height}.rgb')
+
+    def _readTile(self, key):
+        """Reads a processed logo from the disk cache. Returns None if there isn't one."""
+        if not self.cacheDir:
+            return None
+
+        try:
+            with open(self._tilePath(key), 'rb') as fp:
+                data = fp.read()
+            width, height = struct.unpack('<HH', data[:4])
+            return Image.frombytes("RGB", (width, height), data[4:])
+        except (OSError, ValueError, struct.error):
+            return None
+
+    def _writeTile(self, key, image):
+        """Writes a processed logo to the disk cache. Failing to do so isn't fatal, it'll just be reprocessed next time."""
+        if not self.cacheDir:
+            return
+
+        path = self._tilePath(key)
+        try:
+            os.makedirs(self.cacheDir, exist_ok=True)
+            with open(path + '.tmp', 'wb') as fp:
+                fp.write(struct.pack('<HH', *image.size))
+                fp.write(image.tobytes())
+            os.replace(path + '.tmp', path)
+        except OSError as e:
+            print('Unable to cache logo')
+            print(e)
+
+# Shared by all renderers.
+logoCache = LogoCache()
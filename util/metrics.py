@@ -0,0 +1,146 @@
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from contextlib import contextmanager
+import logging
+import logging.handlers
+import threading
+import time
+
+# Upper bounds of the histogram buckets, in seconds. Covers everything from a single fade step to a slow API call.
+BUCKETS = (.001, .0025, .005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5, 10, 30)
+
+class Histogram:
+    """Counts how many observations fell into each bucket, along with their total."""
+
+    def __init__(self, buckets=BUCKETS) -> None:
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0
+
+    def observe(self, value):
+        self.count += 1
+        self.sum += value
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+class Metrics:
+    """Timing histograms for each phase of the scoreboard loop, plus gauges and counters read when the metrics are requested."""
+
+    def __init__(self, prefix="scoreboard") -> None:
+        self.prefix = prefix
+        self.histograms = {}
+        self.gauges = {}
+        self.counters = {}
+        self.lock = threading.Lock()
+
+    def observe(self, phase, seconds):
+        """Records how long a phase took."""
+        with self.lock:
+            histogram = self.histograms.get(phase)
+            if histogram is None:
+                histogram = self.histograms[phase] = Histogram()
+            histogram.observe(seconds)
+
+    @contextmanager
+    def timer(self, phase):
+        """Times the body of a with statement as the given phase."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(phase, time.perf_counter() - start)
+
+    def addGauge(self, name, function):
+        """Adds a value that's read each time the metrics are requested. Ex. the number of cached frames."""
+        self.gauges[name] = function
+
+    def addCounter(self, name, function):
+        """Adds a total that only ever goes up, read each time the metrics are requested. Ex. the number of JSON documents parsed.
+        Exported with a _total suffix, so Prometheus rate() and increase() work on it.
+        """
+        self.counters[name] = function
+
+    def render(self):
+        """Returns all metrics in the Prometheus text format."""
+        lines = []
+        with self.lock:
+            if self.histograms:
+                name = f'{self.prefix}_phase_seconds'
+                lines.append(f'# HELP {name} Time spent in each phase of the scoreboard loop.')
+                lines.append(f'# TYPE {name} histogram')
+            for phase, histogram in sorted(self.histograms.items()):
+                cumulative = 0
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{{phase="{phase}",le="{bound}"}} {cumulative}')
+                lines.append(f'{name}_bucket{{phase="{phase}",le="+Inf"}} {histogram.count}')
+                lines.append(f'{name}_sum{{phase="{phase}"}} {histogram.sum}')
+                lines.append(f'{name}_count{{phase="{phase}"}} {histogram.count}')
+
+        for gauge, function in sorted(self.gauges.items()):
+            try:
+                value = function()
+            except Exception:
+                continue
+            lines.append(f'# TYPE {self.prefix}_{gauge} gauge')
+            lines.append(f'{self.prefix}_{gauge} {value}')
+
+        for counter, function in sorted(self.counters.items()):
+            try:
+                value = function()
+            except Exception:
+                continue
+            lines.append(f'# TYPE {self.prefix}_{counter}_total counter')
+            lines.append(f'{self.prefix}_{counter}_total {value}')
+
+        return '\n'.join(lines) + '\n'
+
+    def summary(self):
+        """Returns a one line summary of the count and mean of each phase, for logging."""
+        with self.lock:
+            return ' '.join(f'{phase}={h.count}x{h.sum / h.count * 1000:.1f}ms' for phase, h in sorted(self.histograms.items()) if h.count)
+
+    def startServer(self, port, host="127.0.0.1"):
+        """Serves the metrics at http://host:port/metrics from a background thread."""
+        metrics = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path != '/metrics':
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+
+                body = metrics.render().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = HTTPServer((host, port), MetricsHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+    def startLog(self, path, interval=60, maxBytes=1024 * 1024, backupCount=3):
+        """Writes a summary line to a rotating log file every interval seconds from a background thread."""
+        logger = logging.getLogger('scoreboard.metrics')
+        logger.setLevel(logging.INFO)
+        handler = logging.handlers.RotatingFileHandler(path, maxBytes=maxBytes, backupCount=backupCount)
+        handler.setFormatter(logging.Formatter('%(asctime)s %(message)s'))
+        logger.addHandler(handler)
+
+        def writeSummaries():
+            while True:
+                time.sleep(interval)
+                logger.info(self.summary())
+
+        threading.Thread(target=writeSummaries, daemon=True).start()
+
+# Shared by the whole process.
+metrics = Metrics()
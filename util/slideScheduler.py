@@ -0,0 +1,45 @@
+from api.gameDiff import SCORE
+import heapq
+
+# Events that interrupt the rotation, and their priority. Lower goes first.
+PRIORITIES = {
+    SCORE: 0
+}
+
+class SlideScheduler:
+    """Decides when the regular rotation of games should be interrupted to show an event right away.
+
+    Events are queued by priority, then by the order they came in. A game only has one event queued at a time,
+    since the latest version of the game is shown when its turn comes anyway.
+    """
+
+    def __init__(self) -> None:
+        self.pending = []
+        self.pendingKeys = set()
+        self.count = 0
+
+    def addEvents(self, events):
+        """Queues the events that should interrupt the rotation. Everything else is ignored."""
+        for event in events:
+            if event.kind not in PRIORITIES or event.key in self.pendingKeys:
+                continue
+
+            # A score that went down is a correction, not worth interrupting for.
+            if event.kind == SCORE and not event.getScoringTeams():
+                continue
+
+            heapq.heappush(self.pending, (PRIORITIES[event.kind], self.count, event))
+            self.pendingKeys.add(event.key)
+            self.count += 1
+
+    def hasPending(self):
+        return bool(self.pending)
+
+    def nextEvent(self):
+        """Returns the most important queued event, or None if nothing is queued."""
+        if not self.pending:
+            return None
+
+        event = heapq.heappop(self.pending)[2]
+        self.pendingKeys.discard(event.key)
+        return event